@@ -0,0 +1,435 @@
+import argparse
+import http.client
+from http.cookies import SimpleCookie
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from cookiecutter.main import cookiecutter
+
+
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE = os.path.dirname(FOLDER)
+BASELINE_FILE = os.path.join(FOLDER, 'baseline.json')
+
+# Cookiecutter answers of the benchmarked app
+CONTEXT = {
+    'app_name': 'bench_app',
+    'theme': 'dark',
+    'environment': 'linux',
+    'add_login_page': True
+}
+
+# Share of the requests of each scenario, like a browser loading the app
+# once and then navigating, logging in and toggling the drawer
+WEIGHTS = {
+    'index': 1,
+    'layout': 1,
+    'dependencies': 1,
+    'navigation': 4,
+    'login': 1,
+    'drawer': 2
+}
+
+PERCENTILES = [50, 95, 99]
+
+# Server of the benchmark, without the login rate limits, so the login
+# scenario measures the password checks instead of rejected attempts
+ENTRY_POINT = '''from app import server
+from extensions.rate_limit import RateLimiter
+from pages.login.login_auth import LoginAuth
+
+LoginAuth.USER_LIMITER = RateLimiter(capacity=float("inf"), refill_rate=0)
+LoginAuth.IP_LIMITER = LoginAuth.USER_LIMITER
+'''
+
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+
+def percentile(values:list, q:float) -> float:
+    """Nearest-rank percentile of sorted values."""
+
+    if not values:
+        return float('nan')
+    index = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+
+def generate_app(output_dir:str) -> str:
+    """Render the cookiecutter and return the folder of the app."""
+
+    app_dir = cookiecutter(
+        TEMPLATE,
+        no_input = True,
+        output_dir = output_dir,
+        extra_context = CONTEXT
+    )
+    with open(os.path.join(app_dir, 'bench_server.py'), 'w') as w:
+        w.write(ENTRY_POINT)
+    return app_dir
+
+
+
+class Server:
+    """The app running under gunicorn on localhost, without login rate limits.
+
+    Parameters
+    ----------
+    app_dir : str
+        Folder of the generated app.
+    workers : int
+        Number of gunicorn workers.
+
+    """
+
+    def __init__(self, app_dir:str, workers:int):
+        self.app_dir = app_dir
+        self.workers = workers
+        self.port = _free_port()
+        self.process = None
+
+
+    def __enter__(self) -> 'Server':
+        self.process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', 'bench_server:server',
+                '--workers', str(self.workers),
+                '--bind', f'127.0.0.1:{self.port}',
+                '--log-level', 'warning'
+            ],
+            cwd = self.app_dir,
+            stdout = subprocess.DEVNULL
+        )
+        self.wait()
+        return self
+
+
+    def __exit__(self, *args):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+    def wait(self, timeout:float=60):
+        """Block until the server answers `_dash-layout`, polling every 0.2 s."""
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError('gunicorn exited before serving the app.')
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=5)
+                conn.request('GET', '/_dash-layout')
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError('gunicorn did not start in time.')
+
+
+
+class Client:
+    """Keep-alive connection with its own cookies, like a browser tab."""
+
+    def __init__(self, port:int):
+        self.port = port
+        self.cookies = {}
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+
+
+    def request(self, method:str, path:str, body:dict=None) -> int:
+        """Send a request and return its status, or 0 if it failed."""
+
+        data = None if body is None else json.dumps(body).encode()
+        headers = {} if body is None else {'Content-Type': 'application/json'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        try:
+            self.conn.request(method, path, body=data, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+            return 0
+
+        for header in response.msg.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                if morsel.value:
+                    self.cookies[name] = morsel.value
+                else:
+                    self.cookies.pop(name, None)
+        return response.status
+
+
+
+def _callback_body(dependency:dict, values:dict) -> dict:
+    """Body of a `_dash-update-component` request for a callback."""
+
+    def prop(item):
+        key = f'{item["id"]}.{item["property"]}'
+        return {**item, 'value': values.get(key)}
+
+    outputs = [
+        {'id': output.rsplit('.', 1)[0], 'property': output.rsplit('.', 1)[1]}
+        for output in dependency['output'].strip('.').split('...')
+    ]
+    inputs = [prop(item) for item in dependency['inputs']]
+
+    return {
+        'output': dependency['output'],
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': inputs,
+        'changedPropIds': [f'{item["id"]}.{item["property"]}' for item in inputs[:1]],
+        'state': [prop(item) for item in dependency['state']]
+    }
+
+
+
+def scenarios(port:int) -> dict:
+    """Requests of each scenario, as (method, path, body).
+
+    Callbacks are found in `_dash-dependencies`. The drawer toggles only
+    reach the server when `CLIENTSIDE_CALLBACKS` is off, so the scenario is
+    skipped otherwise.
+
+    The first login, as admin, is also sent once by every client before the
+    load, so the other scenarios run as a logged user.
+
+    """
+
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    conn.request('GET', '/_dash-dependencies')
+    dependencies = json.loads(conn.getresponse().read())
+
+    def find(output_part):
+        for dependency in dependencies:
+            if output_part in dependency['output'] and not dependency.get('clientside_function'):
+                return dependency
+        return None
+
+    result = {
+        'index': [('GET', '/login', None)],
+        'layout': [('GET', '/_dash-layout', None)],
+        'dependencies': [('GET', '/_dash-dependencies', None)]
+    }
+
+    pages = find('_pages_content.children')
+    if pages is not None:
+        result['navigation'] = [
+            ('POST', '/_dash-update-component', _callback_body(pages, {
+                '_pages_location.pathname': path,
+                '_pages_location.search': ''
+            }))
+            for path in ['/login', '/page1', '/forbidden', '/missing']
+        ]
+
+    login = find('login-page--location.href')
+    if login is not None:
+        result['login'] = [
+            ('POST', '/_dash-update-component', _callback_body(login, {
+                'login-form--button.n_clicks': 1,
+                'login-form--user.value': user,
+                'login-form--password.value': password,
+                'login-page--location.search': '?page=/page1'
+            }))
+            for user, password in [('admin', 'admin'), ('guest', 'wrong')]
+        ]
+
+    drawer = find('DrawerMultiLi')
+    if drawer is not None:
+        result['drawer'] = [
+            ('POST', '/_dash-update-component', _callback_body(drawer, {}))
+        ]
+
+    return result
+
+
+
+def run_load(port:int, requests:dict, concurrency:int, duration:float, setup:list=()) -> dict:
+    """Send requests from several threads and time them.
+
+    Each thread is a client with its own cookies, which first sends the
+    `setup` requests, like a login, without timing them. Responses with a
+    status of 400 or more count as errors.
+
+    Returns
+    -------
+    dict
+        Latencies in seconds and error count of each scenario, and the
+        elapsed time.
+
+    """
+
+    plan = [
+        (name, request)
+        for name, options in requests.items()
+        for request in options
+        for _ in range(WEIGHTS.get(name, 1) * (12 // len(options) or 1))
+    ]
+    results = {name: {'latencies': [], 'errors': 0} for name in requests}
+    lock = threading.Lock()
+
+    clients = [Client(port) for _ in range(concurrency)]
+    for client in clients:
+        for method, path, body in setup:
+            if client.request(method, path, body) != 200:
+                raise RuntimeError(f'Setup request to {path} failed.')
+        if setup and not client.cookies:
+            raise RuntimeError('The server did not start a session.')
+
+    deadline = time.monotonic() + duration
+
+    def run(client, seed):
+        rng = random.Random(seed)
+        latencies = {name: [] for name in requests}
+        errors = {name: 0 for name in requests}
+
+        while time.monotonic() < deadline:
+            name, (method, path, body) = rng.choice(plan)
+            started = time.perf_counter()
+            status = client.request(method, path, body)
+            latencies[name].append(time.perf_counter() - started)
+            errors[name] += not 200 <= status < 400
+
+        with lock:
+            for name in requests:
+                results[name]['latencies'].extend(latencies[name])
+                results[name]['errors'] += errors[name]
+
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=run, args=(client, i))
+        for i, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {'elapsed': time.perf_counter() - started, 'scenarios': results}
+
+
+
+def summarize(load:dict) -> dict:
+    """Percentiles in milliseconds and throughput of a load run."""
+
+    summary = {}
+    total = 0
+    for name, result in load['scenarios'].items():
+        latencies = sorted(result['latencies'])
+        total += len(latencies)
+        summary[name] = {
+            'requests': len(latencies),
+            'errors': result['errors'],
+            'rps': round(len(latencies) / load['elapsed'], 1),
+            **{
+                f'p{q}': round(percentile(latencies, q) * 1000, 2)
+                for q in PERCENTILES
+            }
+        }
+    summary['total'] = {'requests': total, 'rps': round(total / load['elapsed'], 1)}
+    return summary
+
+
+
+def compare(results:dict, baseline:dict, tolerance:float) -> list:
+    """Scenarios whose p95 or throughput got worse than the baseline."""
+
+    regressions = []
+    for workers, scenarios_summary in results.items():
+        for name, current in scenarios_summary.items():
+            previous = baseline.get(workers, {}).get(name)
+            if previous is None:
+                continue
+            if 'p95' in current and current['p95'] > previous['p95'] * (1 + tolerance):
+                regressions.append(
+                    f'{workers} workers, {name}: p95 {previous["p95"]} -> {current["p95"]} ms'
+                )
+            if current['rps'] < previous['rps'] * (1 - tolerance):
+                regressions.append(
+                    f'{workers} workers, {name}: {previous["rps"]} -> {current["rps"]} req/s'
+                )
+    return regressions
+
+
+
+def print_table(workers:int, summary:dict):
+    print(f'\n{workers} worker(s)')
+    print(f'{"scenario":<14}{"requests":>10}{"errors":>8}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}')
+    for name, row in summary.items():
+        if name == 'total':
+            continue
+        print(
+            f'{name:<14}{row["requests"]:>10}{row["errors"]:>8}{row["rps"]:>10}'
+            f'{row["p50"]:>10}{row["p95"]:>10}{row["p99"]:>10}'
+        )
+    print(f'{"total":<14}{summary["total"]["requests"]:>10}{"":>8}{summary["total"]["rps"]:>10}')
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description = 'Load test the generated app under gunicorn.'
+    )
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads.')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds per worker count.')
+    parser.add_argument('--output', help='Save the results to this JSON file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the baseline.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed regression (0.2 = 20%%).')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='charlotte-bench-')
+    try:
+        app_dir = generate_app(tmp)
+        results = {}
+        for workers in args.workers:
+            with Server(app_dir, workers) as server:
+                requests = scenarios(server.port)
+                skipped = sorted(set(WEIGHTS) - set(requests))
+                if skipped:
+                    print(f'Skipping {", ".join(skipped)}: no server callback.')
+                summary = summarize(
+                    run_load(
+                        server.port, requests, args.concurrency, args.duration,
+                        setup = requests.get('login', [])[:1]
+                    )
+                )
+            results[str(workers)] = summary
+            print_table(workers, summary)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as w:
+            json.dump(results, w, indent=2)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w') as w:
+            json.dump(results, w, indent=2)
+        print(f'\nBaseline saved to {os.path.relpath(BASELINE_FILE, TEMPLATE)}')
+
+    elif os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r') as r:
+            regressions = compare(results, json.load(r), args.tolerance)
+        print('\nRegressions against the baseline:' if regressions else '\nNo regressions against the baseline.')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1 if regressions else 0)
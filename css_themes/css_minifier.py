@@ -1,10 +1,575 @@
-import requests
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import hashlib
+import json
+import os
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+
+# Bump this whenever the output of `minify` changes, so cached files are rebuilt
+MINIFIER_VERSION = '3'
+
+# Names of the files located at `css_themes` folder
+CSS_FILES = [
+    'components',
+    'charlotte_dark',
+    'charlotte_light',
+    'dracula'
+]
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(FOLDER, '.minify_cache.json')
+DIST_FOLDER = os.path.join(FOLDER, 'dist')
+
+# Units that can be dropped from a zero length
+ZERO_UNITS = 'px|em|rem|ex|ch|vw|vh|vmin|vmax|cm|mm|in|pt|pc|q'
+
+# Math functions, where a unitless zero is a number instead of a length
+MATH_FUNCTIONS = re.compile(r'(?<![\w-])(?:-[a-z]+-)?(?:calc|min|max|clamp)\(', re.I)
+
+# Named colors shorter than their HEX code and vice-versa
+HEX_TO_NAME = {
+    '#f00': 'red',
+    '#c0c0c0': 'silver',
+    '#808080': 'gray',
+    '#800000': 'maroon',
+    '#800080': 'purple',
+    '#008000': 'green',
+    '#808000': 'olive',
+    '#000080': 'navy',
+    '#008080': 'teal',
+    '#ffa500': 'orange',
+    '#a52a2a': 'brown',
+    '#ffd700': 'gold',
+    '#ff7f50': 'coral',
+    '#d2b48c': 'tan',
+    '#ff6347': 'tomato',
+}
+NAME_TO_HEX = {
+    'white': '#fff',
+    'black': '#000',
+    'yellow': '#ff0',
+    'fuchsia': '#f0f',
+    'magenta': '#f0f',
+}
+
+# Only these properties have their color keywords rewritten
+COLOR_PROPERTIES = re.compile(r'color|background|border|outline|shadow|fill|stroke')
+
+_SIDES = ('top', 'right', 'bottom', 'left')
+_CORNERS = ('top-left', 'top-right', 'bottom-right', 'bottom-left')
+_FONT_VARIANTS = ('caps', 'ligatures', 'numeric', 'east-asian', 'alternates', 'position')
+
+# Longhands reset by each shorthand, which may be shorthands themselves
+SHORTHANDS = {
+    'font': {
+        'font-style',
+        'font-variant',
+        'font-weight',
+        'font-stretch',
+        'font-size',
+        'line-height',
+        'font-family',
+        'font-size-adjust',
+        'font-kerning',
+        'font-feature-settings',
+        'font-language-override',
+        'font-optical-sizing',
+        'font-variation-settings',
+    },
+    'font-variant': {f'font-variant-{v}' for v in _FONT_VARIANTS},
+    'margin': {f'margin-{s}' for s in _SIDES},
+    'margin-block': {'margin-block-start', 'margin-block-end'},
+    'margin-inline': {'margin-inline-start', 'margin-inline-end'},
+    'padding': {f'padding-{s}' for s in _SIDES},
+    'padding-block': {'padding-block-start', 'padding-block-end'},
+    'padding-inline': {'padding-inline-start', 'padding-inline-end'},
+    'inset': set(_SIDES),
+    'inset-block': {'inset-block-start', 'inset-block-end'},
+    'inset-inline': {'inset-inline-start', 'inset-inline-end'},
+    'border': {
+        *(f'border-{s}' for s in _SIDES),
+        'border-width',
+        'border-style',
+        'border-color',
+        'border-image',
+    },
+    **{
+        f'border-{s}': {f'border-{s}-{p}' for p in ('width', 'style', 'color')}
+        for s in _SIDES
+    },
+    **{
+        f'border-{p}': {f'border-{s}-{p}' for s in _SIDES}
+        for p in ('width', 'style', 'color')
+    },
+    'border-radius': {f'border-{c}-radius' for c in _CORNERS},
+    'border-image': {
+        'border-image-source',
+        'border-image-slice',
+        'border-image-width',
+        'border-image-outset',
+        'border-image-repeat',
+    },
+    'outline': {'outline-color', 'outline-style', 'outline-width'},
+    'background': {
+        'background-color',
+        'background-image',
+        'background-position',
+        'background-size',
+        'background-repeat',
+        'background-attachment',
+        'background-origin',
+        'background-clip',
+    },
+    'background-position': {'background-position-x', 'background-position-y'},
+    'list-style': {'list-style-type', 'list-style-position', 'list-style-image'},
+    'text-decoration': {
+        'text-decoration-line',
+        'text-decoration-style',
+        'text-decoration-color',
+        'text-decoration-thickness',
+    },
+    'text-emphasis': {'text-emphasis-style', 'text-emphasis-color'},
+    'overflow': {'overflow-x', 'overflow-y'},
+    'overscroll-behavior': {'overscroll-behavior-x', 'overscroll-behavior-y'},
+    'flex': {'flex-grow', 'flex-shrink', 'flex-basis'},
+    'flex-flow': {'flex-direction', 'flex-wrap'},
+    'gap': {'row-gap', 'column-gap'},
+    'grid-gap': {'gap', 'grid-row-gap', 'grid-column-gap'},
+    'grid-row-gap': {'row-gap'},
+    'grid-column-gap': {'column-gap'},
+    'grid': {'grid-template', 'grid-auto-rows', 'grid-auto-columns', 'grid-auto-flow'},
+    'grid-template': {
+        'grid-template-rows',
+        'grid-template-columns',
+        'grid-template-areas',
+    },
+    'grid-area': {'grid-row', 'grid-column'},
+    'grid-row': {'grid-row-start', 'grid-row-end'},
+    'grid-column': {'grid-column-start', 'grid-column-end'},
+    'place-content': {'align-content', 'justify-content'},
+    'place-items': {'align-items', 'justify-items'},
+    'place-self': {'align-self', 'justify-self'},
+    'columns': {'column-width', 'column-count'},
+    'column-rule': {'column-rule-width', 'column-rule-style', 'column-rule-color'},
+    'transition': {
+        'transition-property',
+        'transition-duration',
+        'transition-timing-function',
+        'transition-delay',
+        'transition-behavior',
+    },
+    'animation': {
+        'animation-name',
+        'animation-duration',
+        'animation-timing-function',
+        'animation-delay',
+        'animation-iteration-count',
+        'animation-direction',
+        'animation-fill-mode',
+        'animation-play-state',
+    },
+    'mask': {
+        'mask-image',
+        'mask-mode',
+        'mask-position',
+        'mask-size',
+        'mask-repeat',
+        'mask-origin',
+        'mask-clip',
+        'mask-composite',
+    },
+    'container': {'container-name', 'container-type'},
+}
+
+# Shorthands whose values follow the top, right, bottom, left order
+BOX_PROPERTIES = {
+    'margin',
+    'padding',
+    'inset',
+    'border-width',
+    'border-style',
+    'border-color',
+}
+
+# Selectors that other browsers reject, along with the rest of their list
+VENDOR_SELECTOR = re.compile(r':-[a-z]+-')
+
+_STRING = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_LITERAL = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\([^)]*\))''', re.I)
+_COMMENT = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/''', re.S)
+
+
+
+def _outside_strings(text:str, func) -> str:
+    """Apply `func` only to the parts of `text` outside strings and urls."""
+
+    parts = _LITERAL.split(text)
+    return ''.join(
+        part if i % 2 else func(part)
+        for i, part in enumerate(parts)
+    )
+
+
+
+def _scan(css:str, i:int) -> int:
+    """Find the next `{`, `}` or `;` outside strings and parentheses."""
+
+    depth = 0
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            match = _STRING.match(css, i)
+            i = match.end() if match else len(css)
+            continue
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth = max(depth - 1, 0)
+        elif depth == 0 and c in '{};':
+            return i
+        i += 1
+    return i
+
+
+
+def _parse(css:str, i:int=0) -> tuple:
+    """Split CSS into a tree of statements (str) and blocks (tuple)."""
+
+    nodes = []
+    while i < len(css):
+        j = _scan(css, i)
+        head = css[i:j].strip()
+        if j == len(css):
+            if head:
+                nodes.append(head)
+            return nodes, j
+        if css[j] == '{':
+            children, i = _parse(css, j+1)
+            nodes.append((head, children))
+        else:
+            if head:
+                nodes.append(head)
+            i = j + 1
+            if css[j] == '}':
+                return nodes, i
+    return nodes, i
+
+
+
+def _shortest_hex(match:re.Match) -> str:
+    code = match.group(1).lower()
+    if len(code) in (6, 8) and all(code[k] == code[k+1] for k in range(0, len(code), 2)):
+        code = code[::2]
+    code = f'#{code}'
+    return HEX_TO_NAME.get(code, code)
+
+
+
+def _rgb_to_hex(match:re.Match) -> str:
+    channels = [int(c) for c in match.groups()]
+    if any(c > 255 for c in channels):
+        return match.group(0)
+    return '#' + ''.join(f'{c:02x}' for c in channels)
+
+
+
+def _minify_value(value:str, colors:bool, lengths:bool=True) -> str:
+
+    def compress(v:str) -> str:
+        v = re.sub(r'\s+', ' ', v)
+        v = re.sub(r'\s*([,/])\s*', r'\1', v)
+        v = re.sub(r'\(\s+', '(', v)
+        v = re.sub(r'\s+\)', ')', v)
+        v = re.sub(r'\s*!\s*important', '!important', v, flags=re.I)
+
+        # Numbers: 0.50 -> .5 | 1.0 -> 1
+        v = re.sub(r'(?<![\w.#-])(-?\d*\.\d*?)0+(?=\D|$)', r'\1', v)
+        v = re.sub(r'(?<![\w.#-])(-?\d+)\.(?=\D|$)', r'\1', v)
+        v = re.sub(r'(?<![\w.#])(-?)0+\.(\d)', r'\1.\2', v)
+
+        # Zero lengths: 0px -> 0 (math functions require the unit)
+        if lengths and not MATH_FUNCTIONS.search(v):
+            v = re.sub(
+                rf'(?<![\w.#-])-?(?:0+\.?0*|\.0+)(?:{ZERO_UNITS})(?![\w%])',
+                '0',
+                v,
+                flags = re.I
+            )
+
+        # Colors
+        v = re.sub(
+            r'rgb\(\s*(\d{1,3}),(\d{1,3}),(\d{1,3})\)',
+            _rgb_to_hex,
+            v,
+            flags = re.I
+        )
+        v = re.sub(r'#([0-9a-fA-F]{3,8})\b', _shortest_hex, v)
+        if colors:
+            v = re.sub(
+                r'(?<![\w#-])(' + '|'.join(NAME_TO_HEX) + r')(?![\w-])',
+                lambda m: NAME_TO_HEX[m.group(1).lower()],
+                v,
+                flags = re.I
+            )
+        return v
+
+    return _outside_strings(value, compress).strip()
+
+
+
+def _shorten_box(value:str) -> str:
+    """Collapse a 4-sided shorthand to its shortest form: 1 2 1 2 -> 1 2."""
+
+    important = value.endswith('!important')
+    if important:
+        value = value[:-len('!important')]
+
+    sides = value.split(' ')
+    if 2 <= len(sides) <= 4 and '(' not in value:
+        if len(sides) == 4 and sides[3] == sides[1]:
+            sides = sides[:3]
+        if len(sides) == 3 and sides[2] == sides[0]:
+            sides = sides[:2]
+        if len(sides) == 2 and sides[1] == sides[0]:
+            sides = sides[:1]
+        value = ' '.join(sides)
+
+    return value + '!important' if important else value
+
+
+
+def _minify_statement(statement:str) -> str:
+    """Minify an at-rule statement or a declaration."""
+
+    if statement.startswith('@'):
+        return _minify_prelude(statement)
+
+    prop, sep, value = statement.partition(':')
+    if not sep:
+        return re.sub(r'\s+', ' ', statement)
+    prop = prop.strip()
+    if not prop.startswith('--'):
+        prop = prop.lower()
+    colors = COLOR_PROPERTIES.search(prop) is not None
+    # Custom properties may be used in `calc`, so they keep their units
+    value = _minify_value(value, colors, lengths=not prop.startswith('--'))
+    if prop in BOX_PROPERTIES:
+        value = _shorten_box(value)
+    return f'{prop}:{value}'
+
+
+
+def _minify_selector(selector:str) -> str:
+
+    def compress(s:str) -> str:
+        s = re.sub(r'\s+', ' ', s)
+        s = re.sub(r'\s*([>+~,])\s*', r'\1', s)
+        s = re.sub(r'\(\s+', '(', s)
+        s = re.sub(r'\s+\)', ')', s)
+        return s
+
+    return _outside_strings(selector, compress).strip()
+
+
+
+def _minify_prelude(prelude:str) -> str:
+
+    def compress(s:str) -> str:
+        s = re.sub(r'\s+', ' ', s)
+        s = re.sub(r'\s*,\s*', ',', s)
+        s = re.sub(r'\(\s*([\w-]+)\s*:\s*', r'(\1:', s)
+        s = re.sub(r'\(\s+', '(', s)
+        s = re.sub(r'\s+\)', ')', s)
+        return s
+
+    return _outside_strings(prelude, compress).strip()
+
+
+
+def _property(declaration:str) -> str:
+    return declaration.partition(':')[0]
+
+
+
+def _longhands(prop:str) -> set:
+    """The property and every longhand it resets, recursively."""
+
+    found = {prop}
+    pending = [prop]
+    while pending:
+        for longhand in SHORTHANDS.get(pending.pop(), ()):
+            if longhand not in found:
+                found.add(longhand)
+                pending.append(longhand)
+    return found
+
+
+
+def _touched(prop:str) -> set:
+    """Names that two properties share if they may set the same value.
+
+    These are the longhands of `SHORTHANDS` and, for properties missing
+    from it, the first part of their name, like 'font' for 'font-smooth'.
+    Vendor prefixes are ignored.
+
+    """
+
+    if prop.startswith('--'):
+        return {prop}
+    longhands = _longhands(re.sub(r'^-[a-z]+-', '', prop))
+    return longhands | {p.split('-')[0] for p in longhands}
+
+
+
+def _is_fallback(value:str) -> bool:
+    """Whether a value may be unsupported, making earlier values a fallback."""
+    return '(' in value or re.search(r'(^|\W)-[a-z]+-', value) is not None
+
+
+
+def _dedupe(declarations:list) -> list:
+    """Drop declarations overridden later in the same block.
+
+    Declarations repeated verbatim are always dropped. A property set again
+    with a different value is dropped only if neither value could be a
+    fallback for browsers that do not support the other.
+
+    """
+
+    last = {}
+    kept = []
+    for declaration in reversed(declarations):
+        prop, _, value = declaration.partition(':')
+        if declaration in kept:
+            continue
+        later = last.get(prop)
+        if (
+            later is not None
+            and not prop.startswith('--')
+            and not _is_fallback(value)
+            and not _is_fallback(later)
+            and (later.endswith('!important') or not value.endswith('!important'))
+        ):
+            continue
+        last.setdefault(prop, value)
+        kept.append(declaration)
+    return kept[::-1]
+
+
+
+def _is_rule(node) -> bool:
+    return (
+        isinstance(node, tuple)
+        and not node[0].startswith('@')
+        and all(isinstance(c, str) for c in node[1])
+    )
+
+
+
+def _find_duplicate(out:list, selector:str, declarations:list):
+    """Index of an earlier rule with `selector` that can absorb `declarations`.
+
+    A rule is only merged into an earlier one if nothing in between sets any
+    of its properties, or a shorthand or longhand of them, so the cascade
+    is preserved.
+
+    """
+
+    touched = set().union(*(_touched(_property(d)) for d in declarations))
+    for i in range(len(out)-1, -1, -1):
+        node = out[i]
+        if not _is_rule(node):
+            return None
+        if node[0] == selector:
+            return i
+        between = set().union(*(_touched(_property(d)) for d in node[1]))
+        if 'all' in between or between & touched:
+            return None
+    return None
+
+
+
+def _minify_nodes(nodes:list) -> list:
+    """Minify a list of nodes and merge rules with duplicate selectors."""
+
+    out = []
+    for node in nodes:
+
+        if isinstance(node, str):
+            out.append(_minify_statement(node))
+            continue
+
+        head, children = node
+        if head.startswith('@'):
+            out.append((_minify_prelude(head), _minify_nodes(children)))
+            continue
+
+        head = _minify_selector(head)
+        children = _minify_nodes(children)
+        if not children:
+            continue
+
+        if not _is_rule((head, children)):
+            out.append((head, children))
+            continue
+
+        # Same selector as an earlier rule
+        i = _find_duplicate(out, head, children)
+        if i is not None:
+            out[i] = (head, _dedupe(out[i][1] + children))
+            continue
+
+        # Adjacent rules with the same body become one selector list, unless
+        # a vendor-specific selector could invalidate the whole list
+        children = _dedupe(children)
+        if (
+            out
+            and _is_rule(out[-1])
+            and out[-1][1] == children
+            and not VENDOR_SELECTOR.search(out[-1][0] + head)
+        ):
+            out[-1] = (f'{out[-1][0]},{head}', children)
+            continue
+
+        out.append((head, children))
+
+    return out
+
+
+
+def _serialize(nodes:list, top:bool=True) -> str:
+
+    parts = []
+    for node in nodes:
+        if isinstance(node, str):
+            parts.append(node)
+        else:
+            parts.append(f'{node[0]}{{{_serialize(node[1], top=False)}}}')
+
+    # Blocks need no separator and the last declaration needs no `;`
+    css = ''
+    for i, part in enumerate(parts):
+        css += part
+        if not part.endswith('}') and (top or i < len(parts) - 1):
+            css += ';'
+    return css
 
 
 
 def minify(file_content:str) -> str:
-    """Access Toptal's CSS Minifier API.
-    
+    """Minify CSS locally.
+
+    Removes comments and whitespace, shortens colors, numbers and zero
+    lengths and merges rules with duplicate selectors.
+
     Parameters
     ----------
     file_content : str
@@ -13,33 +578,137 @@ def minify(file_content:str) -> str:
     Returns
     -------
     str
-        Minifier CSS in str format.
+        Minified CSS in str format.
 
     """
 
-    payload = {'input': file_content}
-    url = 'https://www.toptal.com/developers/cssminifier/raw'
-    r = requests.post(url, payload)
-    return r.text
+    css = _COMMENT.sub(lambda m: m.group(1) or '', file_content)
+    nodes, _ = _parse(css)
+    return _serialize(_minify_nodes(nodes))
+
+
+
+def _checksum(content:str) -> str:
+    return hashlib.sha256(f'{MINIFIER_VERSION}\n{content}'.encode()).hexdigest()
+
+
+
+def _build(file:str) -> tuple:
+    """Minify `{file}.css` into `{file}.min.css` and return its checksum."""
+
+    with open(os.path.join(FOLDER, f'{file}.css'), 'r') as r:
+        file_content = r.read()
+
+    minified = minify(file_content)
+
+    with open(os.path.join(FOLDER, f'{file}.min.css'), 'w') as w:
+        w.write(minified)
+
+    return file, _checksum(file_content)
+
+
+
+def _load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, 'r') as r:
+            return json.load(r)
+    except (OSError, ValueError):
+        return {}
+
+
+
+def stale_files(files:list, cache:dict) -> list:
+    """List the files whose content changed since they were last minified.
+
+    Parameters
+    ----------
+    files : list of str
+        Names of the files located at `css_themes` folder.
+    cache : dict[str, str]
+        Checksums of the last minified version of each file.
+
+    Returns
+    -------
+    list of str
+        Files that must be minified again.
+
+    """
+
+    stale = []
+    for file in files:
+        with open(os.path.join(FOLDER, f'{file}.css'), 'r') as r:
+            checksum = _checksum(r.read())
+        min_file = os.path.join(FOLDER, f'{file}.min.css')
+        if cache.get(file) != checksum or not os.path.exists(min_file):
+            stale.append(file)
+    return stale
+
+
+
+def precompress(file:str) -> str:
+    """Write a fingerprinted copy of `{file}.min.css` and its compressed siblings.
+
+    Parameters
+    ----------
+    file : str
+        Name of a file located at `css_themes` folder.
+
+    Returns
+    -------
+    str
+        Name of the fingerprinted file, like `dracula.1a2b3c4d5e6f.min.css`,
+        written to `css_themes/dist` along with its `.gz` and `.br` versions.
+
+    """
+
+    with open(os.path.join(FOLDER, f'{file}.min.css'), 'rb') as r:
+        content = r.read()
+
+    name = f'{file}.{hashlib.sha256(content).hexdigest()[:12]}.min.css'
+    path = os.path.join(DIST_FOLDER, name)
+    os.makedirs(DIST_FOLDER, exist_ok=True)
+
+    with open(path, 'wb') as w:
+        w.write(content)
+    with open(f'{path}.gz', 'wb') as w:
+        w.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(f'{path}.br', 'wb') as w:
+            w.write(brotli.compress(content, quality=11))
+
+    return name
 
 
 
 if __name__ == '__main__':
 
-    # Names of the files located at `css_themes` folder
-    CSS_FILES = [
-        'components',
-        'charlotte_dark',
-        'charlotte_light',
-        'dracula'
-    ]
+    parser = argparse.ArgumentParser(description='Minify the Charlotte CSS themes.')
+    parser.add_argument('--force', action='store_true', help='Ignore the cache.')
+    parser.add_argument(
+        '--precompress',
+        action = 'store_true',
+        help = 'Write fingerprinted .gz and .br files to css_themes/dist.'
+    )
+    args = parser.parse_args()
+
+    cache = {} if args.force else _load_cache()
+    files = stale_files(CSS_FILES, cache)
+
+    if files:
+        with ProcessPoolExecutor() as executor:
+            for file, checksum in executor.map(_build, files):
+                cache[file] = checksum
+                print(f'Minified {file}.css')
+
+        with open(CACHE_FILE, 'w') as w:
+            json.dump(cache, w, indent=2, sort_keys=True)
 
-    for file in CSS_FILES:
+    else:
+        print('Nothing to minify.')
 
-        with open(f'css_themes/{file}.css', 'r') as r:
-            file_content = r.read()
-        
-        minified = minify(file_content)
+    if args.precompress:
+        with ProcessPoolExecutor() as executor:
+            manifest = dict(zip(CSS_FILES, executor.map(precompress, CSS_FILES)))
 
-        with open(f'css_themes/{file}.min.css', 'w') as w:
-            w.write(minified)
+        with open(os.path.join(DIST_FOLDER, 'manifest.json'), 'w') as w:
+            json.dump(manifest, w, indent=2, sort_keys=True)
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import sys
+
+from css_minifier import CACHE_FILE, CSS_FILES, FOLDER, _build, _load_cache, stale_files
+
+APP_FOLDER = os.path.join(os.path.dirname(FOLDER), '{{cookiecutter.app_name}}')
+THEME_FILE = os.path.join(APP_FOLDER, 'assets', 'css', 'theme.css')
+
+sys.path.insert(0, APP_FOLDER)
+from colors import charlotte_dark, charlotte_light, dracula, ramps
+
+
+
+# Names of the theme colors, as in the `colors` modules
+COLORS = ['red', 'orange', 'yellow', 'green', 'cyan', 'blue', 'purple', 'pink']
+SHADES = [f'shade{i}' for i in range(8)]
+
+# Lightness steps of each color exported as `--{color}-1` (darkest) to `--{color}-9`
+STEPS = 9
+
+FONTS_URL = 'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap'
+
+# Options of `cookiecutter.json`, with the colors and parameters of each theme
+THEMES = {
+    'dark': {
+        'file': 'charlotte_dark',
+        'module': charlotte_dark,
+        'font': "'Poppins', sans-serif"
+    },
+    'light': {
+        'file': 'charlotte_light',
+        'module': charlotte_light,
+        'font': "'Poppins', sans-serif"
+    },
+    'dracula': {
+        'file': 'dracula',
+        'module': dracula,
+        'font': "'Fira Code', monospace"
+    }
+}
+
+
+
+def theme_css(theme:str) -> str:
+    """Build the CSS of a theme from its `colors` module.
+
+    Parameters
+    ----------
+    theme : {'dark', 'light', 'dracula'}
+        Theme option of `cookiecutter.json`.
+
+    Returns
+    -------
+    str
+        CSS of the color classes, with the lightness steps of every color
+        as custom properties.
+
+    """
+
+    params = THEMES[theme]
+    module = params['module']
+    colors = {name: getattr(module, name.upper()) for name in COLORS + SHADES}
+    steps = dict(zip(COLORS, ramps([colors[name] for name in COLORS], STEPS)))
+
+    lines = [
+        f'/* Generated by theme_generator.py from colors/{params["file"]}.py. Do not edit. */',
+        '',
+        f"@import url('{FONTS_URL}');",
+        '',
+        ':root {'
+    ]
+    for name, color in colors.items():
+        lines.append(f'  --{name}: {color};')
+        lines.extend(f'  --{name}-{i+1}: {step};' for i, step in enumerate(steps.get(name, [])))
+    lines.append('}')
+
+    width = max(map(len, colors)) + 1
+    blocks = [
+        [f'.{name:<{width}}{{color: {colors[name]}}}' for name in COLORS],
+        [f'.{name:<{width}}{{color: {colors[name]}}}' for name in SHADES],
+        [f'.bg-{name:<{width}}{{background-color: {colors[name]}}}' for name in COLORS],
+        [
+            f'.bg-hover-{name + ":hover":<{width + 6}}'
+            f'{{background-color: {module.HOVER[name.upper()]}}}'
+            for name in COLORS
+        ],
+        [f'.bg-{name:<{width}}{{background-color: {colors[name]}}}' for name in SHADES],
+        [
+            '/*****   THEME SPECIFIC PARAMETERS   *****/',
+            '',
+            f'* {{font-family: {params["font"]};}}',
+            f'body {{background-color: {colors["shade1"]}}}',
+            f'.sidebar .nav-links li:hover {{background: {colors["blue"]}}}'
+        ]
+    ]
+    for block in blocks:
+        lines.append('')
+        lines.extend(block)
+
+    return '\n'.join(lines) + '\n'
+
+
+
+def _jinja_safe(css:str) -> str:
+    """Keep cookiecutter from reading CSS as Jinja syntax."""
+
+    if any(tag in css for tag in ('{{', '{%', '{#')):
+        return '{% raw %}' + css + '{% endraw %}'
+    return css
+
+
+
+def render_theme_file() -> str:
+    """Content of the app `theme.css`, one Jinja branch per theme."""
+
+    def read(file):
+        with open(os.path.join(FOLDER, f'{file}.min.css'), 'r') as r:
+            return _jinja_safe(r.read())
+
+    content = ''
+    for i, (theme, params) in enumerate(THEMES.items()):
+        tag = 'if' if i == 0 else 'elif'
+        content += f'{{%- {tag} cookiecutter.theme == "{theme}" -%}}\n'
+        content += f'{read(params["file"])}\n\n'
+    content += '{% endif %}\n'
+    content += read('components')
+
+    return content
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description = 'Generate the theme CSS from the colors package.'
+    )
+    parser.add_argument('--force', action='store_true', help='Ignore the cache.')
+    args = parser.parse_args()
+
+    for theme, params in THEMES.items():
+        path = os.path.join(FOLDER, f'{params["file"]}.css')
+        with open(path, 'w') as w:
+            w.write(theme_css(theme))
+        print(f'Generated {params["file"]}.css')
+
+    cache = {} if args.force else _load_cache()
+    for file in stale_files(CSS_FILES, cache):
+        file, cache[file] = _build(file)
+        print(f'Minified {file}.css')
+
+    with open(CACHE_FILE, 'w') as w:
+        json.dump(cache, w, indent=2, sort_keys=True)
+
+    with open(THEME_FILE, 'w') as w:
+        w.write(render_theme_file())
+    print(f'Updated {os.path.relpath(THEME_FILE, os.path.dirname(FOLDER))}')
@@ -3,14 +3,16 @@ import sys
 from cookiecutter.utils import rmtree
 
 
-# Remove `Procfile` if OS is not linux
+# Remove `Procfile` and gunicorn settings if OS is not linux
 if "{{cookiecutter.environment}}" != "linux":
     os.remove(os.path.join(os.getcwd(), "Procfile"))
+    os.remove(os.path.join(os.getcwd(), "gunicorn.conf.py"))
 
 
-# Remove `login` folder if `add_login_page` is `False`
+# Remove `login` folder and users file if `add_login_page` is `False`
 if not {{cookiecutter.add_login_page}}:
     rmtree("pages/login")
+    os.remove(os.path.join(os.getcwd(), "data", "users.json"))
 
 
 # Add python version to `runtime.txt`
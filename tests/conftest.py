@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules of the template that do not need rendering, and the CSS tools
+sys.path[:0] = [os.path.join(ROOT, '{{cookiecutter.app_name}}'), os.path.join(ROOT, 'css_themes')]
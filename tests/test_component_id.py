@@ -0,0 +1,64 @@
+import pytest
+from dash import Dash, html, register_page
+
+from components import Box, component_id, id_scope
+
+
+
+@pytest.fixture
+def app():
+    app = Dash(__name__, use_pages=True, pages_folder='')
+    yield app
+    component_id.STRICT = False
+
+
+
+def box_id(layout) -> str:
+    """ID of the first `Box` of a layout, read from its title."""
+
+    for component in layout._traverse():
+        if str(getattr(component, 'id', '')).endswith('--title'):
+            return component.id[:-len('--title')]
+    raise LookupError('No Box in the layout.')
+
+
+
+def page_layout(**kwargs):
+    return html.Div(Box(children='Content', title='Page 2'))
+
+
+
+@id_scope('/scoped')
+def scoped_layout(**kwargs):
+    return html.Div(Box(children='Content', title='Scoped'))
+
+
+
+def test_layout_function_without_scope(app):
+    register_page('pages.page2.page2', path='/page2', layout=page_layout)
+    app.layout = html.Div()
+
+    client = app.server.test_client()
+    assert client.get('/_dash-layout').status_code == 200
+    assert client.get('/_dash-dependencies').status_code == 200
+
+    with app.server.test_request_context('/page2'):
+        first = box_id(page_layout())
+        second = box_id(page_layout())
+    assert first != second
+
+
+
+def test_layout_function_in_scope(app):
+    with app.server.test_request_context('/scoped'):
+        assert box_id(scoped_layout()) == 'scoped--box-0'
+        assert box_id(scoped_layout()) == 'scoped--box-0'
+
+
+
+def test_strict_raises_without_scope(app):
+    component_id.STRICT = True
+    with app.server.test_request_context('/page2'):
+        with pytest.raises(RuntimeError):
+            page_layout()
+        assert box_id(scoped_layout()) == 'scoped--box-0'
@@ -0,0 +1,33 @@
+import pytest
+
+from css_minifier import minify
+
+
+
+@pytest.mark.parametrize('css, expected', [
+    ('a{padding:0px}', 'a{padding:0}'),
+    ('a{margin:max(0px, 10rem)}', 'a{margin:max(0px,10rem)}'),
+    ('a{width:min(0px, 1em)}', 'a{width:min(0px,1em)}'),
+    ('a{top:clamp(0px, 1vw, 2em)}', 'a{top:clamp(0px,1vw,2em)}'),
+    ('a{left:calc(0px + 1em)}', 'a{left:calc(0px + 1em)}'),
+    ('a{--gap:0px}', 'a{--gap:0px}'),
+    ('a{grid-template-columns:minmax(0px, 1fr)}', 'a{grid-template-columns:minmax(0,1fr)}'),
+])
+def test_zero_lengths(css, expected):
+    assert minify(css) == expected
+
+
+
+@pytest.mark.parametrize('css', [
+    'a{color:red}b{font:12px serif}a{line-height:2}',
+    'a{color:red}b{columns:3}a{column-width:2px}',
+    'a{color:red}b{inset:1px}a{top:0}',
+    'a{color:red}b{border:0}a{border-top-color:red}',
+])
+def test_no_merge_across_shorthands(css):
+    assert minify(css) == css
+
+
+
+def test_merge_unrelated_properties():
+    assert minify('a{color:red}b{margin:0}a{padding:0}') == 'a{color:red;padding:0}b{margin:0}'
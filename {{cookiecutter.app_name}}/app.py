@@ -1,19 +1,21 @@
 # Native Python packages
-import logging
-from socket import gethostname
+import json
+import os
 
 # Web stuff
 from dash import (
     Dash,
     Input,
     Output,
-    no_update,
     page_container
 )
 from flask import Flask
+import plotly.io as pio
+from werkzeug.middleware.proxy_fix import ProxyFix
 {% if cookiecutter.environment == "windows" %}from waitress import serve{% endif %}
 
 # Charlotte components
+from colors import register_templates
 from components import (
     Dashboard,
     Drawer,
@@ -23,12 +25,57 @@ from components import (
     DrawerFooter,
     Navbar
 )
-{% if cookiecutter.add_login_page %}from pages.login.login_auth import LoginAuth{% endif %}
+from extensions import ErrorLog, FrozenDependencies, FrozenLayout, PrecompressedAssets
+from extensions.lazy_pages import LazyPages
+from extensions.metrics import CallbackMetrics
+from extensions.server_session import (
+    ServerSessionInterface,
+    {% if cookiecutter.environment == "linux" %}SQLiteSessionStore{% else %}MemorySessionStore{% endif %},
+    load_secret_key
+)
+from extensions.warm_up import WarmUp
+{% if cookiecutter.add_login_page %}from extensions.route_guard import RouteGuard, PUBLIC, PRIVATE
+from pages.login.login_auth import LoginAuth{% endif %}
 
 
-# Create server with secret key
+# Create server with secret key, from the environment or kept in `data`
 server = Flask(__name__)
-server.secret_key = 'SECRET_KEY'
+server.secret_key = os.environ.get('SECRET_KEY') or load_secret_key('data/secret_key')
+
+# Read the client IP and scheme from the headers of the proxies in front of
+# the app, like a load balancer. Set `PROXY_HOPS` to their number
+proxy_hops = int(os.environ.get('PROXY_HOPS', {% if cookiecutter.environment == "linux" %}1{% else %}0{% endif %}))
+if proxy_hops:
+    server.wsgi_app = ProxyFix(server.wsgi_app, x_for = proxy_hops, x_proto = proxy_hops)
+
+# Keep sessions in the server, with only their ID in the cookie
+server.session_interface = ServerSessionInterface(
+    store = {% if cookiecutter.environment == "linux" %}SQLiteSessionStore('data/sessions.db'){% else %}MemorySessionStore(){% endif %}
+)
+{% if cookiecutter.add_login_page %}
+
+
+# Redirect users without access before the dashboard is loaded
+route_guard = RouteGuard(
+    server = server,
+    status = LoginAuth.check_status,
+    access = {
+        '/login': PUBLIC,
+        '/forbidden': PUBLIC,
+        '/metrics': PUBLIC,
+        '/ready': PUBLIC,
+        '/page1': PRIVATE,
+        '/page2': PRIVATE
+    }
+)
+{% endif %}
+
+
+# Serve the theme fingerprinted and precompressed
+static_files = PrecompressedAssets(
+    server = server,
+    sources = ['assets/css/theme.css']
+)
 
 
 
@@ -38,15 +85,38 @@ app = Dash(
     server = server,
     title = '{{cookiecutter.app_name}}',
     use_pages = True,
+    pages_folder = '',
+    suppress_callback_exceptions = True,
     update_title = 'Updating...',
+    assets_ignore = r'theme\.css',
+    external_stylesheets = static_files.urls,
 )
 
+# Register the pages without importing them, instead of Dash (`pages_folder`).
+# Pages are imported on their first request, so callbacks are not validated
+# against every page layout (`suppress_callback_exceptions`)
+lazy_pages = LazyPages('pages')
+
+
 
+# Figures use the Charlotte template of the theme, unless told otherwise
+register_templates()
+pio.templates.default = '{% if cookiecutter.theme == "dracula" %}dracula{% else %}charlotte_{{cookiecutter.theme}}{% endif %}'
 
-# Instanciate Error Handler
-file_handler = logging.FileHandler('data/errorlog.log')
-file_handler.setLevel(logging.WARNING)
-server.logger.addHandler(file_handler)
+
+
+# Instanciate Error Handler, writing from a background thread
+error_log = ErrorLog(
+    logger = server.logger,
+    path = 'data/errorlog.log'
+)
+
+# Latency, size and errors of each callback, exposed on `/metrics`
+callback_metrics = CallbackMetrics(
+    server = server,
+    callbacks = app.callback_map,
+    path = {% if cookiecutter.environment == "linux" %}'data/metrics.db'{% else %}None{% endif %}
+)
 
 
 
@@ -102,52 +172,35 @@ app.layout = Dashboard(
 
 
 
-{% if cookiecutter.add_login_page %}@app.callback(
-    Output('dashboard--location', 'href'),
+# Serialize the static layout and the callbacks only once per process,
+# with an ETag so browsers revalidate them instead of downloading again
+frozen_layout = FrozenLayout(app, eager=True)
+frozen_dependencies = FrozenDependencies(app)
+
+
+
+{% if cookiecutter.add_login_page %}# Navbar title of each page
+NAVBAR_TITLES = {
+    '/login': 'User Authentication',
+    '/page1': 'Example Page 1',
+    '/forbidden': 'Unauthorized User'
+}
+
+# Update the Navbar title in the browser
+app.clientside_callback(
+    'function(path) {'
+    f'    return {json.dumps(NAVBAR_TITLES)}[path] || {json.dumps("{{cookiecutter.app_name}}")};'
+    '}',
     Output('dashboard-navbar--title', 'children'),
-    Input('dashboard--location', 'pathname'))
-def init_app(path):
-    """Redirects to login page if user is not logged in.
-    
-    Inputs
-    ------
-    dashboard--location.pathname
-        Page the user is trying to access.
-
-    Outputs
-    -------
-    dashboard--location.href
-        URL of the login page to which the user is redirected.
-    dashboard-navbar--title.children
-        Updated navbar title.
-
-    """
-
-    # Get current HTTP status
-    status = LoginAuth.check_status()
-
-    # Change Navbar title if user is authenticated
-    if (status==200) or (path=='/login'):
-        try:
-            return no_update, {
-                '/login': 'User Authentication',
-                '/page1': 'Example Page 1'
-            }[path]
-        except KeyError:
-            return no_update, '{{cookiecutter.app_name}}'
-
-    # Change Navbar title if user had access denied
-    elif path=='/forbidden':
-        return no_update, 'Unauthorized User'
-
-    # Go to 403 page
-    elif status==403:
-        return f'http://{gethostname()}:{{cookiecutter.port}}/forbidden', no_update
-
-    # Go to login page
-    elif status==401:
-        return f'http://{gethostname()}:{{cookiecutter.port}}/login?page={path}', no_update
-{% endif %}{% if cookiecutter.environment == "windows" %}
+    Input('dashboard--location', 'pathname')
+)
+
+
+
+{% endif %}# Build the shell and the callback list once before taking traffic,
+# `/ready` answers 200 when done. Pages stay lazy until requested
+warm_up = WarmUp(app, pages = False)
+{% if cookiecutter.environment == "windows" %}
 
 
 # Run app
@@ -0,0 +1,19 @@
+from extensions.callback_cache import CallbackCache
+from extensions.server_store import ServerStore
+{% if cookiecutter.add_login_page %}from pages.login.login_auth import LoginAuth
+{% endif %}
+
+# Results of the page callbacks, reused for the same inputs. Decorate
+# callbacks with `@cache.memoize()` under `@callback`
+cache = CallbackCache(
+    path={% if cookiecutter.environment == "linux" %}"data/cache.db"{% else %}None{% endif %},
+    ttl=300,{% if cookiecutter.add_login_page %}
+    user=LoginAuth.current_user,{% endif %}
+)
+
+# Data of `dashboard--data` kept in the server, with only its key in the
+# browser. Send `store.put(data)` to the store and read it with `store.get`
+store = ServerStore(
+    path={% if cookiecutter.environment == "linux" %}"data/store.db"{% else %}None{% endif %},
+    max_items=8,
+)
@@ -1 +1,2 @@
-from .colors import Color
+from .colors import Color, ramps
+from .templates import TEMPLATES, register_templates
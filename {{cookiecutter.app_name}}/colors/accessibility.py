@@ -0,0 +1,266 @@
+"""Colorblind simulation and WCAG contrast of whole palettes.
+
+Every function works on a palette at once, as NumPy arrays, so checking a
+theme costs a few matrix products instead of one `Color` per pair.
+
+Run as a script to cache the report of a theme next to its module:
+
+    python -m colors.accessibility charlotte_dark
+
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .colors import Color
+
+
+
+# Full severity matrices of Machado, Oliveira and Fernandes (2009),
+# applied to linear RGB
+DEFICIENCIES = {
+    'protan': np.array([
+        [ 0.152286,  1.052583, -0.204868],
+        [ 0.114503,  0.786281,  0.099216],
+        [-0.003882, -0.048116,  1.051998]
+    ]),
+    'deutan': np.array([
+        [ 0.367322,  0.860646, -0.227968],
+        [ 0.280085,  0.672501,  0.047413],
+        [-0.011820,  0.042940,  0.968881]
+    ]),
+    'tritan': np.array([
+        [ 1.255528, -0.076749, -0.178779],
+        [-0.078411,  0.930809,  0.147602],
+        [ 0.004733,  0.691367,  0.303900]
+    ])
+}
+
+# Minimum contrast of normal text for WCAG level AA
+AA_CONTRAST = 4.5
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+
+
+def to_array(colors:Sequence[Color]) -> np.ndarray:
+    """sRGB values of a palette, as an array of shape (n, 3) between 0 and 1."""
+
+    values = np.array([color.value for color in colors], dtype=np.int64)
+    return np.stack([values >> 16, values >> 8 & 0xFF, values & 0xFF], axis=1) / 255
+
+
+
+def from_array(rgb:np.ndarray) -> List[Color]:
+    """Palette of an array of sRGB values between 0 and 1."""
+
+    rgb = np.round(np.clip(rgb, 0, 1) * 255).astype(np.int64)
+    values = rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]
+    return [Color._intern(value) for value in values.tolist()]
+
+
+
+def _to_linear(rgb:np.ndarray) -> np.ndarray:
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+
+def _to_srgb(linear:np.ndarray) -> np.ndarray:
+    linear = np.clip(linear, 0, 1)
+    return np.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * linear ** (1/2.4) - 0.055
+    )
+
+
+
+def simulate(colors:Sequence[Color]) -> Dict[str, List[Color]]:
+    """Palette as seen with each color vision deficiency.
+
+    Parameters
+    ----------
+    colors : sequence of Color
+        Palette to be simulated.
+
+    Returns
+    -------
+    dict[str, list of Color]
+        Simulated palette of each deficiency: 'protan', 'deutan' and
+        'tritan'.
+
+    """
+
+    linear = _to_linear(to_array(colors))
+    matrices = np.stack(list(DEFICIENCIES.values()))
+    simulated = _to_srgb(np.einsum('dij,nj->dni', matrices, linear))
+    return {
+        name: from_array(palette)
+        for name, palette in zip(DEFICIENCIES, simulated)
+    }
+
+
+
+def luminance(colors:Sequence[Color]) -> np.ndarray:
+    """WCAG relative luminance of each color."""
+
+    return _to_linear(to_array(colors)) @ np.array([0.2126, 0.7152, 0.0722])
+
+
+
+def contrast_matrix(
+        foregrounds:Sequence[Color],
+        backgrounds:Sequence[Color]
+    ) -> np.ndarray:
+    """WCAG contrast ratio of every pair of colors.
+
+    Parameters
+    ----------
+    foregrounds : sequence of Color
+        Colors of the text.
+    backgrounds : sequence of Color
+        Colors of the backgrounds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (len(foregrounds), len(backgrounds)), with ratios
+        from 1 to 21.
+
+    """
+
+    fg = luminance(foregrounds)[:, None]
+    bg = luminance(backgrounds)[None, :]
+    return (np.maximum(fg, bg) + 0.05) / (np.minimum(fg, bg) + 0.05)
+
+
+
+def palette(module) -> Dict[str, Color]:
+    """Colors defined in a theme module, by name."""
+
+    return {
+        name: value for name, value in vars(module).items()
+        if name.isupper() and isinstance(value, Color)
+    }
+
+
+
+def report(module) -> dict:
+    """Simulated palettes and contrast matrices of a theme.
+
+    The colors are compared to every `SHADE*` of the theme, or to black and
+    white if the theme has no shades.
+
+    Parameters
+    ----------
+    module : module
+        Theme module, like `colors.charlotte_dark`.
+
+    Returns
+    -------
+    dict
+        'colors' and 'backgrounds' as HEX codes, the 'simulated' palettes
+        and the 'contrast' ratios of each vision, normal included, as
+        `{vision: {color: {background: ratio}}}`.
+
+    """
+
+    colors = palette(module)
+    backgrounds = {
+        name: color for name, color in colors.items()
+        if name.startswith('SHADE')
+    } or {'WHITE': Color('#ffffff'), 'BLACK': Color('#000000')}
+
+    names = list(colors)
+    visions = {'normal': list(colors.values()), **simulate(list(colors.values()))}
+
+    # All visions in one pass: stack the palettes as rows
+    matrix = contrast_matrix(
+        [color for palette in visions.values() for color in palette],
+        list(backgrounds.values())
+    ).reshape(len(visions), len(names), len(backgrounds))
+
+    return {
+        'colors': {name: str(color) for name, color in colors.items()},
+        'backgrounds': {name: str(color) for name, color in backgrounds.items()},
+        'simulated': {
+            vision: dict(zip(names, map(str, palette)))
+            for vision, palette in visions.items()
+            if vision != 'normal'
+        },
+        'contrast': {
+            vision: {
+                name: dict(zip(backgrounds, np.round(row, 2).tolist()))
+                for name, row in zip(names, matrix[i])
+            }
+            for i, vision in enumerate(visions)
+        }
+    }
+
+
+
+def _checksum(module) -> str:
+    colors = ','.join(f'{name}={color}' for name, color in palette(module).items())
+    return hashlib.sha256(colors.encode()).hexdigest()
+
+
+
+def cached_report(theme:str, force:bool=False) -> dict:
+    """Report of a theme, cached as `colors/{theme}.accessibility.json`.
+
+    The cache is rebuilt when any color of the theme changes.
+
+    Parameters
+    ----------
+    theme : str
+        Name of a module of the `colors` package, like 'charlotte_dark'.
+    force : bool, default=False
+        Rebuild the cache even if the theme did not change.
+
+    """
+
+    module = importlib.import_module(f'{__package__}.{theme}')
+    path = os.path.join(FOLDER, f'{theme}.accessibility.json')
+    checksum = _checksum(module)
+
+    if not force:
+        try:
+            with open(path, 'r') as r:
+                cached = json.load(r)
+            if cached.get('checksum') == checksum:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+    result = {'checksum': checksum, **report(module)}
+    with open(path, 'w') as w:
+        json.dump(result, w, indent=2)
+    return result
+
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description = 'Check the palettes under colorblind simulation and WCAG contrast.'
+    )
+    parser.add_argument('themes', nargs='+', help='Modules of the colors package.')
+    parser.add_argument('--force', action='store_true', help='Ignore the cache.')
+    args = parser.parse_args()
+
+    for theme in args.themes:
+        result = cached_report(theme, force=args.force)
+        for vision, contrast in result['contrast'].items():
+            failing = sum(
+                ratio < AA_CONTRAST
+                for ratios in contrast.values()
+                for ratio in ratios.values()
+            )
+            total = sum(len(ratios) for ratios in contrast.values())
+            print(f'{theme} ({vision}): {failing}/{total} pairs below {AA_CONTRAST}:1')
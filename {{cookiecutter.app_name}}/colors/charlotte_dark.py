@@ -21,3 +21,15 @@ SHADE4 = Color(rgb='#A29DA3')
 SHADE5 = Color(rgb='#C1BCC2')
 SHADE6 = Color(rgb='#E0DCE0')
 SHADE7 = Color(rgb='#FFFCFF')
+
+# Backgrounds of hovered elements, by color
+HOVER = {
+    'RED':    Color(rgb='#ff5d6a'),
+    'ORANGE': Color(rgb='#f09768'),
+    'YELLOW': Color(rgb='#fce08c'),
+    'GREEN':  Color(rgb='#b6d463'),
+    'CYAN':   Color(rgb='#39ebbb'),
+    'BLUE':   Color(rgb='#97d2fc'),
+    'PURPLE': Color(rgb='#d89cf8'),
+    'PINK':   Color(rgb='#f37dcc'),
+}
@@ -21,3 +21,15 @@ SHADE4 = Color('#847E85')
 SHADE5 = Color('#656066')
 SHADE6 = Color('#474247')
 SHADE7 = Color('#282629')
+
+# Backgrounds of hovered elements, by color
+HOVER = {
+    'RED':    Color('#ce3643'),
+    'ORANGE': Color('#ce662e'),
+    'YELLOW': Color('#cea21e'),
+    'GREEN':  Color('#7e9e26'),
+    'CYAN':   Color('#1a9c7a'),
+    'BLUE':   Color('#4488b8'),
+    'PURPLE': Color('#a558ce'),
+    'PINK':   Color('#c23f96'),
+}
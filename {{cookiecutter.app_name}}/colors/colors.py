@@ -1,10 +1,19 @@
 import colorsys
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+from weakref import WeakValueDictionary
+
+import numpy as np
 
 
 
 class Color:
     """Charlotte color object.
 
+    Colors are immutable and interned: creating a color with the same HEX
+    code as an existing one returns the same object. The code is stored as
+    one packed integer.
+
     Parmeters
     ---------
     rgb : str
@@ -12,6 +21,10 @@ class Color:
 
     Attributes
     ----------
+    rgb : str
+        Lowercase HEX code, without `#`.
+    value : int
+        HEX code as an integer.
     red : ype.colors.Color.ColorDecomposition
         Red component.
     green : ype.colors.Color.ColorDecomposition
@@ -23,10 +36,13 @@ class Color:
     -------
     __call__(light:float) -> str
         Set a new color lightness.
+    ramp(steps:int, start:float=0.1, stop:float=0.9) -> list[Color]
+        Colors with evenly spaced lightness values.
 
     """
 
     class ColorDecomposition:
+        __slots__ = ('hex', 'int')
         def __init__(self, hex):
             self.hex = hex
             self.int = int(hex,16)
@@ -36,22 +52,76 @@ class Color:
             return self.hex
 
 
-    def __init__(self, rgb:str):
+    __slots__ = ('value', '__weakref__')
+
+    # Every color alive, by value
+    _interned: 'WeakValueDictionary[int, Color]' = WeakValueDictionary()
+
+
+    def __new__(cls, rgb:str):
 
         # Parsing
-        self.rgb = str(rgb)
-        if self.rgb.startswith('#'):
-            self.rgb = self.rgb[1:]
+        rgb = str(rgb)
+        if rgb.startswith('#'):
+            rgb = rgb[1:]
+        if len(rgb) == 3:
+            rgb = ''.join(c*2 for c in rgb)
+
+        return cls._intern(int(rgb, 16))
+
+
+    @classmethod
+    def _intern(cls, value:int) -> 'Color':
+        """The only color object with this value."""
+
+        color = cls._interned.get(value)
+        if color is None:
+            color = object.__new__(cls)
+            object.__setattr__(color, 'value', value)
+            color = cls._interned.setdefault(value, color)
+        return color
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Color objects are immutable.')
+
+
+    def __reduce__(self):
+        return (Color, (self.rgb,))
+
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Color):
+            return self.value == other.value
+        return NotImplemented
+
+
+    def __hash__(self) -> int:
+        return hash(self.value)
 
-        # Decompose
-        self.red = self.ColorDecomposition(self.rgb[:2])
-        self.green = self.ColorDecomposition(self.rgb[2:4])
-        self.blue = self.ColorDecomposition(self.rgb[-2:])
 
-        # Alias
-        self.r = self.red
-        self.g = self.green
-        self.b = self.blue
+    @property
+    def rgb(self) -> str:
+        return f'{self.value:06x}'
+
+
+    # Decompose
+    @property
+    def red(self) -> ColorDecomposition:
+        return self.ColorDecomposition(f'{self.value >> 16:02x}')
+
+    @property
+    def green(self) -> ColorDecomposition:
+        return self.ColorDecomposition(f'{self.value >> 8 & 0xFF:02x}')
+
+    @property
+    def blue(self) -> ColorDecomposition:
+        return self.ColorDecomposition(f'{self.value & 0xFF:02x}')
+
+    # Alias
+    r = red
+    g = green
+    b = blue
 
 
     def __str__(self) -> str:
@@ -77,18 +147,156 @@ class Color:
         
         """
 
-        float2hex = lambda x: f'0{int(round(255*x,0)):x}'[-2:]
+        return _lightness(self.value, light)
+
+
+    def ramp(self, steps:int, start:float=0.1, stop:float=0.9) -> List['Color']:
+        """Colors with evenly spaced lightness values.
+
+        Parameters
+        ----------
+        steps : int
+            Number of colors.
+        start : float, default=0.1
+            Lightness of the first color (between 0 and 1).
+        stop : float, default=0.9
+            Lightness of the last color (between 0 and 1).
+
+        Returns
+        -------
+        list of Color
+            Same as `[self(light) for light in np.linspace(start, stop, steps)]`.
+
+        """
+
+        return ramps([self], steps, start, stop)[0]
 
-        hls = colorsys.rgb_to_hls(
-            r = self.r.int/255,
-            g = self.g.int/255,
-            b = self.b.int/255
-        )
 
-        rgb = colorsys.hls_to_rgb(
-            h = hls[0],
-            l = light,
-            s = hls[2]
+
+@lru_cache(maxsize=4096)
+def _lightness(value:int, light:float) -> Color:
+    """Memoized lightness table of `Color.__call__`."""
+
+    float2int = lambda x: int(round(255*x,0))
+
+    hls = colorsys.rgb_to_hls(
+        r = (value >> 16)/255,
+        g = (value >> 8 & 0xFF)/255,
+        b = (value & 0xFF)/255
+    )
+
+    rgb = colorsys.hls_to_rgb(
+        h = hls[0],
+        l = light,
+        s = hls[2]
+    )
+
+    return Color._intern(
+        float2int(rgb[0]) << 16 | float2int(rgb[1]) << 8 | float2int(rgb[2])
+    )
+
+
+
+def _rgb_to_hs(rgb:np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized hue and saturation of `colorsys.rgb_to_hls`."""
+
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    grey = rangec == 0
+    safe = np.where(grey, 1, rangec)
+
+    s = np.where(
+        sumc/2 <= 0.5,
+        rangec / np.where(grey, 1, sumc),
+        rangec / np.where(grey, 1, 2 - maxc - minc)
+    )
+
+    rc = (maxc-r) / safe
+    gc = (maxc-g) / safe
+    bc = (maxc-b) / safe
+    h = np.where(r == maxc, bc-gc, np.where(g == maxc, 2+rc-bc, 4+gc-rc))
+    h = (h/6) % 1
+
+    return np.where(grey, 0, h), np.where(grey, 0, s)
+
+
+
+def _hls_to_rgb(h:np.ndarray, l:np.ndarray, s:np.ndarray) -> np.ndarray:
+    """Vectorized `colorsys.hls_to_rgb`, returning an array of shape (..., 3)."""
+
+    m2 = np.where(l <= 0.5, l * (1+s), l + s - l*s)
+    m1 = 2*l - m2
+
+    def channel(hue):
+        hue = hue % 1
+        return np.select(
+            [hue < 1/6, hue < 0.5, hue < 2/3],
+            [m1 + (m2-m1)*hue*6, m2, m1 + (m2-m1)*(2/3-hue)*6],
+            m1
         )
 
-        return Color(f'{float2hex(rgb[0])}{float2hex(rgb[1])}{float2hex(rgb[2])}')
+    rgb = np.stack([channel(h + 1/3), channel(h), channel(h - 1/3)], axis=-1)
+    return np.where((s == 0)[..., None], l[..., None], rgb)
+
+
+
+# Ramps already computed, by (value, steps, start, stop)
+_RAMPS: Dict[Tuple[int, int, float, float], List[Color]] = {}
+
+
+
+def ramps(
+        colors:Sequence[Color],
+        steps:int,
+        start:float = 0.1,
+        stop:float = 0.9
+    ) -> List[List[Color]]:
+    """Lightness ramps of a whole palette in one vectorized pass.
+
+    Parameters
+    ----------
+    colors : list of Color
+        Palette.
+    steps : int
+        Number of colors of each ramp.
+    start : float, default=0.1
+        Lightness of the first color of each ramp (between 0 and 1).
+    stop : float, default=0.9
+        Lightness of the last color of each ramp (between 0 and 1).
+
+    Returns
+    -------
+    list of list of Color
+        Matrix of shape (palette, steps). Each ramp is cached, so only
+        colors never seen with the same arguments are computed.
+
+    Examples
+    --------
+    >>> from colors import charlotte_light as light
+    >>> ramps([light.RED, light.BLUE], steps=9)
+
+    """
+
+    keys = [(color.value, steps, start, stop) for color in colors]
+    missing = list(dict.fromkeys(key for key in keys if key not in _RAMPS))
+
+    if missing:
+        values = np.array([key[0] for key in missing])
+        rgb = np.stack([values >> 16, values >> 8 & 0xFF, values & 0xFF], axis=1) / 255
+        h, s = _rgb_to_hs(rgb)
+        l = np.linspace(start, stop, steps)
+
+        # Shape: (colors, steps, 3)
+        matrix = _hls_to_rgb(h[:, None], l[None, :], s[:, None])
+        matrix = np.round(matrix * 255).astype(int)
+        packed = matrix[..., 0] << 16 | matrix[..., 1] << 8 | matrix[..., 2]
+
+        if len(_RAMPS) + len(missing) > 4096:
+            _RAMPS.clear()
+        for key, row in zip(missing, packed.tolist()):
+            _RAMPS[key] = [Color._intern(value) for value in row]
+
+    return [list(_RAMPS[key]) for key in keys]
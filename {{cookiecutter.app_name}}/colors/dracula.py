@@ -21,3 +21,15 @@ SHADE4 = Color(rgb='#A29DA3')
 SHADE5 = Color(rgb='#C1BCC2')
 SHADE6 = Color(rgb='#E0DCE0')
 SHADE7 = Color(rgb='#f8f8f2')
+
+# Backgrounds of hovered elements, by color
+HOVER = {
+    'BLUE':   Color(rgb='#4e5a81'),
+    'CYAN':   Color(rgb='#77cadd'),
+    'GREEN':  Color(rgb='#44da6a'),
+    'ORANGE': Color(rgb='#da9f61'),
+    'PINK':   Color(rgb='#dd69ab'),
+    'PURPLE': Color(rgb='#a27ed4'),
+    'RED':    Color(rgb='#dd4b4b'),
+    'YELLOW': Color(rgb='#c6ce71'),
+}
@@ -0,0 +1,103 @@
+"""Plotly templates of the Charlotte palettes.
+
+The app registers the templates in `plotly.io.templates` once, with
+`register_templates`, so figures only need the template name.
+
+"""
+
+from typing import Dict
+
+import plotly.io as pio
+
+from . import charlotte_dark, charlotte_light, colorblind, dracula
+from .colors import Color
+
+
+
+def _template(
+        colorway: list,
+        text: Color,
+        grid: Color,
+        line: Color,
+        hover: Color,
+        font: str
+    ) -> dict:
+    """Layout of a compact template, with transparent backgrounds.
+
+    The figure is drawn on top of its container, like a `Box`, so only the
+    colors that depend on the theme are set. Templates are copied into every
+    figure sent to the browser, so they are kept small.
+
+    """
+
+    axis = {
+        'gridcolor': str(grid),
+        'linecolor': str(line),
+        'zerolinecolor': str(line),
+        'automargin': True
+    }
+
+    return {'layout': {
+        'colorway': [str(color) for color in colorway],
+        'font': {'color': str(text), 'family': font},
+        'paper_bgcolor': 'rgba(0,0,0,0)',
+        'plot_bgcolor': 'rgba(0,0,0,0)',
+        'hoverlabel': {'bgcolor': str(hover), 'font': {'family': font}},
+        'legend': {'bgcolor': 'rgba(0,0,0,0)'},
+        'xaxis': axis,
+        'yaxis': axis
+    }}
+
+
+
+def _theme_template(module, font:str) -> dict:
+    return _template(
+        colorway = [
+            module.BLUE,
+            module.RED,
+            module.GREEN,
+            module.ORANGE,
+            module.PURPLE,
+            module.CYAN,
+            module.PINK,
+            module.YELLOW
+        ],
+        text = module.SHADE7,
+        grid = module.SHADE2,
+        line = module.SHADE3,
+        hover = module.SHADE1,
+        font = font
+    )
+
+
+
+TEMPLATES: Dict[str, dict] = {
+    'charlotte_light': _theme_template(charlotte_light, 'Poppins, sans-serif'),
+    'charlotte_dark': _theme_template(charlotte_dark, 'Poppins, sans-serif'),
+    'dracula': _theme_template(dracula, 'Fira Code, monospace'),
+    'colorblind': _template(
+        colorway = [
+            colorblind.ORANGE,
+            colorblind.SKYBLUE,
+            colorblind.GREEN,
+            colorblind.YELLOW,
+            colorblind.BLUE,
+            colorblind.RED,
+            colorblind.PURPLE,
+            colorblind.BLACK
+        ],
+        text = colorblind.BLACK,
+        grid = Color('#e5e5e5'),
+        line = colorblind.GREY,
+        hover = Color('#ffffff'),
+        font = 'Poppins, sans-serif'
+    )
+}
+
+
+
+def register_templates():
+    """Add the templates to `plotly.io.templates`, by their names."""
+
+    for name, template in TEMPLATES.items():
+        pio.templates[name] = template
@@ -1,4 +1,5 @@
 from .box import Box
+from .component_id import auto_id, id_scope
 from .dashboard import Dashboard
 from .footer import Footer
 from .navbar import Navbar
@@ -1,10 +1,11 @@
 from typing import Optional
-from uuid import uuid4
 
 from dash import html
 from dash.development.base_component import Component
 from dash_iconify import DashIconify
 
+from .component_id import auto_id
+
 
 class Box(html.Div):
     """Default box.
@@ -60,7 +61,7 @@ class Box(html.Div):
         id: Optional[str] = None,
     ):
 
-        id = id or str(uuid4())
+        id = id or auto_id("box")
 
         box_style = {"border-radius": 10, "margin": 10}
         if isinstance(style, dict):
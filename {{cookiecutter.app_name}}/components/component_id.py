@@ -0,0 +1,134 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import re
+import sys
+import threading
+from typing import DefaultDict, Dict, Iterator, Optional, Tuple
+from uuid import uuid4
+
+import dash
+from flask import has_request_context
+
+# Counters of the active `id_scope`, if any
+_scope: ContextVar[Optional[Tuple[str, Dict[str, int]]]] = ContextVar(
+    "component_id_scope", default=None
+)
+
+# Counters of the components created by module-level code, by module
+_module_counters: DefaultDict[str, DefaultDict[str, int]] = defaultdict(
+    lambda: defaultdict(int)
+)
+_lock = threading.Lock()
+
+# Raise instead of using a random ID for components built while serving a
+# request outside an `id_scope`. Tests set it to find unscoped layouts.
+STRICT = False
+
+
+def _slug(text: str) -> str:
+    """Text usable in a Dash ID, which cannot contain dots."""
+    return re.sub(r"[^0-9A-Za-z_-]+", "-", text).strip("-") or "root"
+
+
+def _caller() -> Tuple[str, str]:
+    """Name of the module creating the component, and of the code object.
+
+    Constructors and the functions of this package are skipped, so a
+    component built inside another component belongs to the same module.
+    The code object is '<module>' for components built at import time.
+
+    """
+
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        inside = module == __package__ or module.startswith(f"{__package__}.")
+        if not inside and frame.f_code.co_name != "__init__":
+            return module, frame.f_code.co_name
+        frame = frame.f_back
+    return "__main__", "<module>"
+
+
+def _page_path(module: str) -> str:
+    """Path of the page registered by a module, or the module name itself."""
+
+    page = dash.page_registry.get(module)
+    if page is not None and page.get("path"):
+        return page["path"]
+    return module
+
+
+@contextmanager
+def id_scope(name: str) -> Iterator[None]:
+    """Number the components created inside the block from zero.
+
+    Use it in layout functions, which are called on every request, so
+    each call gives the same IDs. It also works as a decorator.
+
+    Parameters
+    ----------
+    name : str
+        Prefix of the IDs, like the page path.
+
+    Examples
+    --------
+    >>> @id_scope("/page2")
+    ... def layout():
+    ...     return Box(title="Page 2")    # id='page2--box-0'
+
+    """
+
+    token = _scope.set((_slug(name), defaultdict(int)))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def auto_id(kind: str) -> str:
+    """Deterministic ID of a component created without one.
+
+    IDs are built from the page path, or the module that creates the
+    component, and the order of the component among those of the same
+    kind, like `page1--box-0`. Every worker of the server builds the same
+    layout, so identical layouts serialize to identical bytes.
+
+    Components built by functions while serving a request, like layout
+    functions and callbacks, get a random ID unless they are inside an
+    `id_scope`, since numbering them would continue the count of the
+    previous request.
+
+    Parameters
+    ----------
+    kind : str
+        Type of the component, like 'box'.
+
+    Raises
+    ------
+    RuntimeError
+        If `STRICT` is set and the function serving a request is not
+        inside an `id_scope`.
+
+    """
+
+    scope = _scope.get()
+    if scope is not None:
+        prefix, counters = scope
+    else:
+        module, code = _caller()
+        if code != "<module>" and has_request_context():
+            if STRICT:
+                raise RuntimeError(
+                    f"{code} in {module} creates components without an ID on "
+                    "every request. Wrap it in `id_scope` or pass their IDs."
+                )
+            return str(uuid4())
+        prefix = _slug(_page_path(module))
+        counters = _module_counters[module]
+
+    with _lock:
+        position = counters[kind]
+        counters[kind] += 1
+
+    return f"{prefix}--{kind}-{position}"
@@ -23,7 +23,8 @@ class Dashboard(html.Main):
     {id}
         Container principal.
     {id}--data
-        Componente para armazenamento de dados.
+        Componente para armazenamento de dados. Com um `ServerStore`, guarda
+        apenas a chave dos dados mantidos no servidor.
     {id}--location
         Componente que gerencia a URL da página.
 
@@ -1,9 +1,37 @@
 from typing import List, Optional
-import uuid
 
-from dash import html, callback, Input, Output, State, MATCH
+from dash import html, callback, clientside_callback, Input, Output, State, MATCH
 from dash_iconify import DashIconify
 
+from .component_id import auto_id
+
+# Toggle the menus in the browser, without a request to the server.
+# Set to `False` to fall back to the Python callbacks.
+CLIENTSIDE_CALLBACKS = True
+
+
+def toggle_callback(javascript: str, *dependencies, **kwargs):
+    """Register a callback in the browser or, as a fallback, in the server.
+
+    Parameters
+    ----------
+    javascript : str
+        JavaScript function equivalent to the decorated Python function.
+    *dependencies : dash.Output | dash.Input | dash.State
+        Callback dependencies.
+    **kwargs
+        Keyword arguments passed to the callback, like `prevent_initial_call`.
+
+    """
+
+    def decorator(function):
+        if CLIENTSIDE_CALLBACKS:
+            clientside_callback(javascript, *dependencies, **kwargs)
+            return function
+        return callback(*dependencies, **kwargs)(function)
+
+    return decorator
+
 
 class DrawerSingleItem(html.Li):
     """An item for the Drawer menu.
@@ -106,7 +134,7 @@ class DrawerMultiItem(html.Li):
         href: str = "#",
     ):
 
-        aio_id = aio_id or str(uuid.uuid4())
+        aio_id = aio_id or auto_id("drawer-item")
         if not isinstance(submenu, list):
             submenu = [submenu]
 
@@ -146,7 +174,12 @@ class DrawerMultiItem(html.Li):
             ],
         )
 
-    @callback(
+    @toggle_callback(
+        """
+        function(_, state) {
+            return state === "showMenu" ? "hideMenu" : "showMenu";
+        }
+        """,
         Output(ids.li(MATCH), "className"),
         Input(ids.arrow(MATCH), "n_clicks"),
         State(ids.li(MATCH), "className"),
@@ -249,7 +282,13 @@ class Drawer(html.Div):
             children=[logo, html.Ul(className="nav-links", children=menu)],
         )
 
-    @callback(
+    @toggle_callback(
+        """
+        function(_, state) {
+            const cls = "sidebar bg-shade0";
+            return state === cls ? `${cls} close` : cls;
+        }
+        """,
         Output("drawer", "className"),
         Input("open-drawer", "n_clicks"),
         State("drawer", "className"),
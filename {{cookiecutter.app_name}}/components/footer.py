@@ -1,9 +1,10 @@
 from typing import Optional
-from uuid import uuid4
 
 from dash import html
 from dash.development.base_component import Component
 
+from .component_id import auto_id
+
 
 class Footer(html.Footer):
     """Default footer.
@@ -35,7 +36,7 @@ class Footer(html.Footer):
         id: Optional[str] = None,
     ):
 
-        id = id or str(uuid4())
+        id = id or auto_id("footer")
         super().__init__(
             id=id,
             children=html.Div(
@@ -1,10 +1,11 @@
 from typing import Optional
-import uuid
 
 from dash import html
 from dash.development.base_component import Component
 from dash_iconify import DashIconify
 
+from .component_id import auto_id
+
 
 class Navbar(html.Nav):
     def __init__(
@@ -33,7 +34,7 @@ class Navbar(html.Nav):
 
         """
 
-        id = id or str(uuid.uuid4())
+        id = id or auto_id("navbar")
         super().__init__(
             className="home-content shade7",
             children=[
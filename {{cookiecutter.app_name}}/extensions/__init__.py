@@ -0,0 +1,3 @@
+from .error_log import ErrorLog
+from .frozen_layout import FrozenDependencies, FrozenLayout
+from .static_files import PrecompressedAssets
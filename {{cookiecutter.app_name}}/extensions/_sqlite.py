@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+import os
+import sqlite3
+import threading
+from typing import Iterator
+
+
+class SQLiteFile:
+    """SQLite file shared by the threads and processes of the server.
+
+    Each thread opens its own connection, in autocommit mode. Connections
+    are never shared with forked processes, like the gunicorn workers of a
+    preloaded app, which open their own instead.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite file.
+    timeout : float, default=5
+        Seconds to wait for another connection to release the file.
+    purge_every : int, default=1000
+        Every how many writes `count_write` asks for the idle or expired
+        rows to be deleted.
+
+    """
+
+    def __init__(self, path: str, timeout: float = 5, purge_every: int = 1000):
+
+        self.path = path
+        self.timeout = timeout
+        self.purge_every = purge_every
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def connection(self) -> sqlite3.Connection:
+        """SQLite connection of the current thread and process."""
+
+        if getattr(self._local, "pid", None) != os.getpid():
+            self._local.db = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.pid = os.getpid()
+        return self._local.db
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connection holding the write lock until the block ends.
+
+        Changes are committed if the block succeeds and rolled back if it
+        raises.
+
+        """
+
+        db = self.connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def count_write(self) -> bool:
+        """Count a write, and return whether the idle rows must be deleted."""
+
+        with self._lock:
+            self._writes += 1
+            return self._writes % self.purge_every == 0
@@ -0,0 +1,235 @@
+from collections import OrderedDict
+import functools
+import hashlib
+import json
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dash import ctx
+
+from ._sqlite import SQLiteFile
+
+# Returned by the tiers on a miss, since `None` is a valid result
+_MISSING = object()
+
+
+class CallbackCache:
+    """Memoize the results of Dash callbacks by their inputs.
+
+    Results are kept in a least recently used cache in the process memory
+    and, optionally, in a SQLite file shared by all the processes of the
+    server, so a result computed by one gunicorn worker is reused by the
+    others. Entries expire after `ttl` seconds.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file shared by all the processes of the server. If `None`,
+        results are only kept in the process memory.
+    ttl : float, default=300
+        Seconds a result is reused, unless set for a callback.
+    max_keys : int, default=256
+        Maximum number of results kept in memory. The least recently used
+        results are discarded first.
+    user : callable, optional
+        Function returning the user of the current session, like
+        `LoginAuth.current_user`, for callbacks cached per user.
+
+    Attributes
+    ----------
+    memory_hits : int
+        Results found in the process memory.
+    disk_hits : int
+        Results found in the shared file.
+    misses : int
+        Results computed.
+
+    Examples
+    --------
+    >>> cache = CallbackCache("data/cache.db", user=LoginAuth.current_user)
+    >>> @callback(Output("graph", "figure"), Input("dropdown", "value"))
+    ... @cache.memoize(ttl=60, per_user=True)
+    ... def update_graph(value):
+    ...     return px.line(query(value))
+
+    Notes
+    -----
+    Calls are only cached when their inputs can be serialized to JSON, like
+    the values Dash passes to callbacks. Results are shared, not copied,
+    between the requests of a process and must not be changed in place.
+    The shared file is trusted, like the other files in `data`, since
+    results are stored with `pickle`.
+
+    """
+
+    # Every how many writes the expired results are deleted from the file
+    PURGE_EVERY = 1000
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 300,
+        max_keys: int = 256,
+        user: Optional[Callable[[], Optional[str]]] = None,
+    ):
+
+        self.path = path
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.user = user
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is not None:
+            self._file = SQLiteFile(path, purge_every=self.PURGE_EVERY)
+            self._file.connection().execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters of this process."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def key(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        per_user: bool = False,
+        per_trigger: bool = False,
+    ) -> Optional[str]:
+        """Hash of a function and the inputs of a call, or `None` if the
+        inputs cannot be serialized to JSON."""
+
+        user = self.user() if per_user else None
+        trigger = ctx.triggered_id if per_trigger else None
+        try:
+            data = json.dumps(
+                [func.__module__, func.__qualname__, args, kwargs, user, trigger],
+                sort_keys=True,
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _get(self, key: str) -> Any:
+        """Cached result of a key, or `_MISSING`."""
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None and entry[0] > now:
+                self._memory[key] = entry
+                self.memory_hits += 1
+                return entry[1]
+
+        if self.path is not None:
+            row = (
+                self._file.connection()
+                .execute(
+                    "SELECT value, expires FROM cache WHERE key = ? AND expires > ?",
+                    (key, now),
+                )
+                .fetchone()
+            )
+            if row is not None:
+                value = pickle.loads(row[0])
+                self._remember(key, value, row[1])
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+
+        return _MISSING
+
+    def _set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache the result of a key."""
+
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember(key, value, expires)
+
+        if self.path is not None:
+            try:
+                data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # Kept in this process only
+                return
+            db = self._file.connection()
+            db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, data, expires)
+            )
+            if self._file.count_write():
+                db.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+    def _remember(self, key: str, value: Any, expires: float):
+        with self._lock:
+            self._memory.pop(key, None)
+            self._memory[key] = (expires, value)
+            while len(self._memory) > self.max_keys:
+                self._memory.popitem(last=False)
+
+    def clear(self):
+        """Discard every cached result."""
+
+        with self._lock:
+            self._memory.clear()
+        if self.path is not None:
+            self._file.connection().execute("DELETE FROM cache")
+
+    def memoize(
+        self,
+        ttl: Optional[float] = None,
+        per_user: bool = False,
+        per_trigger: bool = False,
+    ):
+        """Decorator caching the results of a callback.
+
+        Place it under the `callback` decorator, so Dash registers the
+        cached function.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            Seconds a result is reused. Defaults to the `ttl` of the cache.
+        per_user : bool, default=False
+            Cache results separately for each user of `user`.
+        per_trigger : bool, default=False
+            Cache results separately for each input that triggered the
+            callback, for callbacks that branch on `ctx.triggered_id`.
+
+        """
+
+        if per_user and self.user is None:
+            raise ValueError("Caching per user requires the `user` function.")
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = self.key(func, args, kwargs, per_user, per_trigger)
+                if key is None:
+                    # Not cached, the same inputs may not give the same key
+                    return func(*args, **kwargs)
+                value = self._get(key)
+                if value is _MISSING:
+                    with self._lock:
+                        self.misses += 1
+                    value = func(*args, **kwargs)
+                    self._set(key, value, ttl)
+                return value
+
+            return wrapper
+
+        return decorator
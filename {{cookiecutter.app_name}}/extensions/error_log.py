@@ -0,0 +1,156 @@
+import atexit
+import gzip
+import logging
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+import os
+import queue
+import shutil
+from typing import Optional
+
+FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Compress a rotated log file."""
+
+    with open(source, "rb") as r, gzip.open(dest, "wb") as w:
+        shutil.copyfileobj(r, w)
+    os.remove(source)
+
+
+class _SharedRotatingFileHandler(RotatingFileHandler):
+    """Size rotation that notices files rotated by other processes.
+
+    Before deciding to rotate, the handler reopens the file if its path
+    points to a different file than the open stream, so the workers of the
+    server do not rotate the same log twice.
+
+    """
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is not None:
+            try:
+                moved = (
+                    os.stat(self.baseFilename).st_ino
+                    != os.fstat(self.stream.fileno()).st_ino
+                )
+            except FileNotFoundError:
+                moved = True
+            if moved:
+                self.stream.close()
+                self.stream = self._open()
+        return super().shouldRollover(record)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks, counting the records it drops."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class ErrorLog:
+    """Log records written to a rotating file by a background thread.
+
+    The request threads only put the records in a queue, so slow disks and
+    bursts of errors do not add latency to the callbacks. Rotated files are
+    compressed with gzip.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger whose records are written, like `server.logger`.
+    path : str
+        Path of the log file.
+    level : int, default=logging.WARNING
+        Minimum level of the records written.
+    max_bytes : int, default=10485760
+        Size that triggers a rotation (10 MB). Ignored if `when` is set.
+    when : str, optional
+        Rotate by time instead of size, like 'midnight' or 'H'. See
+        `logging.handlers.TimedRotatingFileHandler`.
+    backup_count : int, default=10
+        Number of rotated files kept.
+    queue_size : int, default=10000
+        Records waiting to be written. Further records are dropped and
+        counted in `dropped`, instead of blocking the request.
+
+    Examples
+    --------
+    >>> error_log = ErrorLog(server.logger, "data/errorlog.log", when="midnight")
+
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        path: str,
+        level: int = logging.WARNING,
+        max_bytes: int = 10 * 2**20,
+        when: Optional[str] = None,
+        backup_count: int = 10,
+        queue_size: int = 10000,
+    ):
+
+        if when is None:
+            self.file_handler: logging.FileHandler = _SharedRotatingFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, delay=True
+            )
+        else:
+            self.file_handler = TimedRotatingFileHandler(
+                path, when=when, backupCount=backup_count, delay=True
+            )
+        self.file_handler.namer = _gzip_namer
+        self.file_handler.rotator = _gzip_rotator
+        self.file_handler.setFormatter(logging.Formatter(FORMAT))
+
+        self.logger = logger
+        self.level = level
+        self.queue_size = queue_size
+        self.handler: Optional[_DroppingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+
+        self.start()
+        atexit.register(self.stop)
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full, since the last start."""
+        return 0 if self.handler is None else self.handler.dropped
+
+    def start(self):
+        """Attach the queue to the logger and start the writing thread."""
+
+        self.handler = _DroppingQueueHandler(queue.Queue(self.queue_size))
+        self.handler.setLevel(self.level)
+        self.listener = QueueListener(
+            self.handler.queue, self.file_handler, respect_handler_level=True
+        )
+        self.logger.addHandler(self.handler)
+        self.listener.start()
+
+    def stop(self):
+        """Write the pending records and stop the writing thread."""
+
+        if self.handler is not None:
+            self.logger.removeHandler(self.handler)
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.file_handler.close()
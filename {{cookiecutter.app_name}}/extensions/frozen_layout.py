@@ -0,0 +1,115 @@
+import hashlib
+import threading
+from typing import Optional
+
+from dash import Dash
+from flask import Response, request
+
+
+class FrozenRoute:
+    """Serialize the response of a static Dash route once and serve it with an ETag.
+
+    The ETag is a hash of the serialized bytes, so every worker of the
+    server computes the same one. Browsers revalidate the cached response
+    on every load and get an empty `304 Not Modified` while it is unchanged.
+
+    Parameters
+    ----------
+    app : dash.Dash
+        Dash app that registered the route.
+    route : str
+        Name of the Dash route, like '_dash-layout'.
+    eager : bool, default=False
+        Encode the response immediately instead of on the first request.
+
+    Attributes
+    ----------
+    body : bytes | None
+        Serialized response, or `None` if not encoded yet.
+    etag : str | None
+        Strong ETag of `body`.
+
+    """
+
+    def __init__(self, app: Dash, route: str, eager: bool = False):
+
+        self.app = app
+        self.endpoint = f"{app.config.routes_pathname_prefix}{route}"
+        self.body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self._lock = threading.Lock()
+
+        # Wrap the view Dash registered for the route
+        self._view = app.server.view_functions[self.endpoint]
+        app.server.view_functions[self.endpoint] = self.serve
+
+        if eager:
+            with app.server.test_request_context(self.endpoint):
+                self.freeze()
+
+    def freeze(self) -> bytes:
+        """Encode the response, if not encoded yet, and return its bytes."""
+
+        if self.body is None:
+            with self._lock:
+                if self.body is None:
+                    body = self._view().get_data()
+                    self.etag = hashlib.sha256(body).hexdigest()[:32]
+                    self.body = body
+        return self.body
+
+    def thaw(self):
+        """Discard the cached bytes, so the response is encoded again."""
+        self.body = None
+
+    def serve(self) -> Response:
+        response = Response(self.freeze(), mimetype="application/json")
+        response.set_etag(self.etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+
+
+class FrozenLayout(FrozenRoute):
+    """Serialize a static Dash layout once and serve the cached bytes.
+
+    Dash encodes `app.layout` to JSON on every `_dash-layout` request. For a
+    fixed tree, like the `Dashboard` shell, the result never changes, so it
+    is encoded only once per process.
+
+    Parameters
+    ----------
+    app : dash.Dash
+        Dash app with a static layout already assigned.
+    eager : bool, default=False
+        Encode the layout immediately instead of on the first request.
+
+    Notes
+    -----
+    Layouts defined as functions are rebuilt on purpose for every request
+    and cannot be frozen.
+
+    """
+
+    def __init__(self, app: Dash, eager: bool = False):
+
+        if callable(app.layout):
+            raise ValueError("Layout functions cannot be frozen.")
+
+        super().__init__(app, "_dash-layout", eager=eager)
+
+
+class FrozenDependencies(FrozenRoute):
+    """Serialize the callback list of a Dash app once and serve the cached bytes.
+
+    The list is encoded on the first `_dash-dependencies` request, after
+    every page and callback has been registered.
+
+    Parameters
+    ----------
+    app : dash.Dash
+        Dash app.
+
+    """
+
+    def __init__(self, app: Dash):
+        super().__init__(app, "_dash-dependencies")
@@ -0,0 +1,275 @@
+import ast
+from contextlib import contextmanager
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import dash
+from dash._callback import GLOBAL_CALLBACK_LIST
+
+logger = logging.getLogger(__name__)
+
+# Names that register callbacks when a module is imported
+CALLBACK_NAMES = {"callback", "clientside_callback"}
+
+
+def _call_name(node: ast.AST) -> str:
+    """Name of a called function, like `register_page` or `dash.callback`."""
+
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _module_path(module: str) -> Optional[str]:
+    """File of a module of the app, or `None` for installed packages."""
+
+    path = module.replace(".", os.sep)
+    for candidate in (f"{path}.py", os.path.join(path, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _imports(tree: ast.AST, module: str) -> List[str]:
+    """Modules imported by a module, including names that may be submodules."""
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                package = module.rsplit(".", node.level)[0]
+                base = f"{package}.{base}" if base else package
+            names.append(base)
+            names.extend(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _registers_callbacks(path: str, module: str) -> bool:
+    """Whether importing a module registers callbacks, directly or through
+    the modules of the app it imports that were not imported yet."""
+
+    pending = [(path, module)]
+    seen = {module}
+    while pending:
+        path, module = pending.pop()
+        with open(path, encoding="utf-8") as r:
+            tree = ast.parse(r.read(), filename=path)
+        if any(_call_name(node) in CALLBACK_NAMES for node in ast.walk(tree)):
+            return True
+        for name in _imports(tree, module):
+            if name in seen or name in sys.modules:
+                continue
+            seen.add(name)
+            imported = _module_path(name)
+            if imported is not None:
+                pending.append((imported, name))
+    return False
+
+
+@contextmanager
+def _ignore_register_page() -> Iterator[None]:
+    """Make `dash.register_page` do nothing while importing a page.
+
+    Page modules read it from `dash` when imported, so the entry registered
+    up front is kept. The caller must hold the lock of `LazyPages`.
+
+    """
+
+    register_page = dash.register_page
+    dash.register_page = lambda *args, **kwargs: None
+    try:
+        yield
+    finally:
+        dash.register_page = register_page
+
+
+def inspect_page(path: str, module: str) -> Tuple[Optional[dict], bool]:
+    """Read the `register_page` arguments of a page without importing it.
+
+    Parameters
+    ----------
+    path : str
+        Path of the page module.
+    module : str
+        Name of the page module, like 'pages.page1.page1'.
+
+    Returns
+    -------
+    dict | None
+        Keyword arguments of `register_page`, or `None` if the module does
+        not register a page.
+    bool
+        Whether the page can be imported lazily. Pages that register
+        callbacks, themselves or through the modules of the app they
+        import, and pages whose arguments are not literals, must be
+        imported at startup.
+
+    """
+
+    with open(path, encoding="utf-8") as r:
+        tree = ast.parse(r.read(), filename=path)
+
+    kwargs = None
+    lazy = True
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and _call_name(node) == "register_page":
+            kwargs = {}
+            for keyword in node.keywords:
+                if keyword.arg in (None, "layout"):
+                    lazy = False
+                    continue
+                if keyword.arg == "module":
+                    continue
+                try:
+                    kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+                except ValueError:
+                    lazy = False
+
+    if kwargs is not None and lazy:
+        lazy = not _registers_callbacks(path, module)
+    return kwargs, lazy
+
+
+def discover(folder: str) -> List[Tuple[str, str]]:
+    """Page modules of a folder, as (module name, path), like Dash Pages."""
+
+    pages = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith((".", "_")))
+        for file in sorted(files):
+            if file.startswith((".", "_")) or not file.endswith(".py"):
+                continue
+            path = os.path.join(root, file)
+            module = os.path.splitext(os.path.relpath(path))[0].replace(os.sep, ".")
+            pages.append((module, path))
+    return pages
+
+
+class LazyPages:
+    """Register the pages of a Dash app up front and import them on first use.
+
+    Paths and titles are read from the `register_page` call of each module
+    without running it. A page module is only imported, and its layout
+    built, the first time the page is requested, which keeps the worker
+    boot short. Pages that register callbacks, themselves or through the
+    modules of the app they import, are imported immediately, since the
+    browser needs their callbacks from the start.
+
+    Parameters
+    ----------
+    folder : str, default='pages'
+        Folder of the page modules, relative to the app.
+
+    Attributes
+    ----------
+    costs : dict[str, float]
+        Seconds spent importing each loaded page and building its layout.
+    lazy : set of str
+        Modules that were registered without being imported.
+
+    Notes
+    -----
+    The app must be created with `use_pages=True, pages_folder=''`, so Dash
+    does not import the pages itself, and `suppress_callback_exceptions=True`.
+    Otherwise Dash builds every layout on the first request to validate the
+    callbacks, which imports the remaining pages at that point.
+
+    Examples
+    --------
+    >>> app = Dash(
+    ...     __name__, use_pages=True, pages_folder="", suppress_callback_exceptions=True
+    ... )
+    >>> lazy_pages = LazyPages("pages")
+
+    """
+
+    def __init__(self, folder: str = "pages"):
+
+        self.costs: Dict[str, float] = {}
+        self.lazy = set()
+        self._lock = threading.Lock()
+
+        for module, path in discover(folder):
+            kwargs, lazy = inspect_page(path, module)
+            if kwargs is None:
+                continue
+            if lazy:
+                dash.register_page(module, layout=self._lazy_layout(module), **kwargs)
+                self.lazy.add(module)
+            else:
+                self.load(module)
+
+    def _lazy_layout(self, module: str) -> Callable:
+        def layout(**kwargs):
+            layout = self.load(module)
+            return layout(**kwargs) if callable(layout) else layout
+
+        return layout
+
+    def load(self, module: str):
+        """Import a page, if not imported yet, and return its layout."""
+
+        with self._lock:
+            if module not in self.costs:
+                started = time.perf_counter()
+                if module in self.lazy:
+                    # Keep the entry registered up front, with the lazy layout
+                    callbacks = len(GLOBAL_CALLBACK_LIST)
+                    with _ignore_register_page():
+                        page = importlib.import_module(module)
+                    if len(GLOBAL_CALLBACK_LIST) > callbacks:
+                        logger.warning(
+                            "%s registered callbacks when imported lazily. "
+                            "Browsers that loaded the app before may not "
+                            "know them, import it at startup instead.",
+                            module,
+                        )
+                else:
+                    page = importlib.import_module(module)
+                if hasattr(page, "layout"):
+                    dash.page_registry[module]["layout"] = page.layout
+                self.costs[module] = time.perf_counter() - started
+
+        return dash.page_registry[module]["layout"]
+
+    def load_all(self):
+        """Import every page not imported yet."""
+
+        for module in list(dash.page_registry):
+            self.load(module)
+
+    def report(self) -> str:
+        """Import cost of each loaded page, the slowest first."""
+
+        lines = [f"{'page':<40}{'path':<20}{'ms':>10}"]
+        for module, cost in sorted(self.costs.items(), key=lambda item: -item[1]):
+            path = dash.page_registry.get(module, {}).get("path", "")
+            lines.append(f"{module:<40}{path:<20}{cost * 1000:>10.1f}")
+        pending = sorted(set(dash.page_registry) - set(self.costs))
+        for module in pending:
+            lines.append(
+                f"{module:<40}{dash.page_registry[module]['path']:<20}{'-':>10}"
+            )
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Usage: python -m extensions.lazy_pages pages
+    from dash import Dash
+
+    app = Dash(__name__, use_pages=True, pages_folder="")
+    lazy_pages = LazyPages(sys.argv[1] if len(sys.argv) > 1 else "pages")
+    lazy_pages.load_all()
+    print(lazy_pages.report())
@@ -0,0 +1,205 @@
+import atexit
+from collections import defaultdict
+import threading
+import time
+from typing import Any, DefaultDict, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from flask import Flask, Response, abort, g, request
+
+from ._sqlite import SQLiteFile
+
+# Upper bounds of the latency histogram, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Name, type and help text of each metric, in the order they are exposed
+METRICS = [
+    ("dash_callback_duration_seconds", "histogram", "Callback latency."),
+    ("dash_callback_request_bytes_total", "counter", "Callback request size."),
+    ("dash_callback_response_bytes_total", "counter", "Callback response size."),
+    ("dash_callback_errors_total", "counter", "Callbacks that failed."),
+]
+
+# (metric name, callback output, histogram bucket)
+Key = Tuple[str, str, str]
+
+
+def _escape(value: str) -> str:
+    """Label value in the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(output: str, le: str) -> str:
+    pairs = [f'output="{_escape(output)}"']
+    if le:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class CallbackMetrics:
+    """Latency, payload size and error metrics of every Dash callback.
+
+    Callbacks are identified by their output, like `page1-graph.figure`.
+    Each request only updates counters in memory. Every `flush_interval`
+    seconds, a worker adds its counters to a SQLite file shared by all the
+    workers of the server, and the metrics route exposes the totals in the
+    Prometheus text format.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        Server the hooks and the route are added to.
+    callbacks : mapping
+        Callbacks of the app by output, like `app.callback_map`. Requests
+        for other outputs are counted under `output="unknown"`, so clients
+        cannot create new series.
+    path : str, optional
+        SQLite file shared by all the processes of the server, like the
+        gunicorn workers. If `None`, metrics only count this process.
+    buckets : sequence of float, optional
+        Upper bounds of the latency histogram, in seconds.
+    route : str, default='/metrics'
+        URL of the metrics.
+    flush_interval : float, default=1
+        Seconds between writes to the shared file.
+    remote_addrs : sequence of str, optional
+        Client addresses allowed to read the metrics. Defaults to the local
+        host. If `None`, everyone can read them.
+
+    """
+
+    def __init__(
+        self,
+        server: Flask,
+        callbacks: Mapping[str, Any],
+        path: Optional[str] = None,
+        buckets: Sequence[float] = BUCKETS,
+        route: str = "/metrics",
+        flush_interval: float = 1,
+        remote_addrs: Optional[Sequence[str]] = ("127.0.0.1", "::1"),
+    ):
+
+        self.path = path
+        self.callbacks = callbacks
+        self.buckets = sorted(buckets)
+        self.flush_interval = flush_interval
+        self.remote_addrs = remote_addrs
+
+        self._deltas: DefaultDict[Key, float] = defaultdict(float)
+        self._totals: DefaultDict[Key, float] = defaultdict(float)
+        self._next_flush = time.monotonic() + flush_interval
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is not None:
+            self._file = SQLiteFile(path)
+            self._file.connection().execute(
+                "CREATE TABLE IF NOT EXISTS metrics (name TEXT, output TEXT, "
+                "le TEXT, value REAL, PRIMARY KEY (name, output, le))"
+            )
+            atexit.register(self.flush)
+
+        server.before_request(self._start)
+        server.after_request(self._record)
+        server.add_url_rule(route, endpoint="callback_metrics", view_func=self.serve)
+
+    def _start(self):
+        if request.path.endswith("/_dash-update-component"):
+            g.callback_started = time.perf_counter()
+
+    def _record(self, response: Response) -> Response:
+        started = g.pop("callback_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+
+        # Dash already parsed the body, so this reads its cache
+        body = request.get_json(silent=True)
+        output = body.get("output") if isinstance(body, dict) else None
+        if not isinstance(output, str) or output not in self.callbacks:
+            output = "unknown"
+        size = 0 if response.is_streamed else response.calculate_content_length()
+
+        with self._lock:
+            deltas = self._deltas
+            name = "dash_callback_duration_seconds"
+            for bucket in self.buckets:
+                if elapsed <= bucket:
+                    deltas[f"{name}_bucket", output, _number(bucket)] += 1
+            deltas[f"{name}_bucket", output, "+Inf"] += 1
+            deltas[f"{name}_sum", output, ""] += elapsed
+            deltas[f"{name}_count", output, ""] += 1
+            deltas["dash_callback_request_bytes_total", output, ""] += (
+                request.content_length or 0
+            )
+            deltas["dash_callback_response_bytes_total", output, ""] += size or 0
+            if response.status_code >= 500:
+                deltas["dash_callback_errors_total", output, ""] += 1
+
+        if time.monotonic() >= self._next_flush:
+            self.flush()
+        return response
+
+    def flush(self):
+        """Add the counters of this worker to the totals."""
+
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(float)
+            self._next_flush = time.monotonic() + self.flush_interval
+            if self.path is None:
+                for key, value in deltas.items():
+                    self._totals[key] += value
+                return
+        if not deltas:
+            return
+
+        with self._file.transaction() as db:
+            db.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (name, output, le) DO UPDATE "
+                "SET value = value + excluded.value",
+                [(*key, value) for key, value in deltas.items()],
+            )
+
+    def collect(self) -> Dict[Key, float]:
+        """Totals of every worker."""
+
+        self.flush()
+        if self.path is None:
+            with self._lock:
+                return dict(self._totals)
+        rows = self._file.connection().execute(
+            "SELECT name, output, le, value FROM metrics"
+        )
+        return {(name, output, le): value for name, output, le, value in rows}
+
+    def render(self) -> str:
+        """Metrics in the Prometheus text format."""
+
+        totals = self.collect()
+        lines: List[str] = []
+        for name, kind, help_text in METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            samples = sorted(
+                (
+                    (key, value)
+                    for key, value in totals.items()
+                    if key[0] == name or key[0].rsplit("_", 1)[0] == name
+                ),
+                key=lambda item: (item[0][1], item[0][0], float(item[0][2] or 0)),
+            )
+            for (sample, output, le), value in samples:
+                lines.append(f"{sample}{_labels(output, le)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self) -> Response:
+        if (
+            self.remote_addrs is not None
+            and request.remote_addr not in self.remote_addrs
+        ):
+            abort(403)
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
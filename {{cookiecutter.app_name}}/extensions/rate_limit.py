@@ -0,0 +1,114 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Optional, Tuple
+
+from ._sqlite import SQLiteFile
+
+
+class RateLimiter:
+    """Token bucket rate limiter.
+
+    Each key owns a bucket that holds up to `capacity` tokens and gains
+    `refill_rate` tokens per second. Every attempt takes one token, and
+    attempts are refused while the bucket is empty.
+
+    Parameters
+    ----------
+    capacity : float
+        Maximum number of attempts in a burst.
+    refill_rate : float
+        Tokens regained per second.
+    path : str, optional
+        SQLite file shared by all the processes of the server, like the
+        gunicorn workers. If `None`, buckets live in the process memory.
+    max_keys : int, default=10000
+        Maximum number of buckets kept in memory. The least recently used
+        buckets are discarded first.
+
+    Examples
+    --------
+    >>> limiter = RateLimiter(capacity=5, refill_rate=1/60)
+    >>> limiter.allow("user:admin")
+    True
+
+    """
+
+    # Every how many attempts the full buckets are purged from the file
+    PURGE_EVERY = 1000
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_rate: float,
+        path: Optional[str] = None,
+        max_keys: int = 10000,
+    ):
+
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.path = path
+        self.max_keys = max_keys
+
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is not None:
+            self._file = SQLiteFile(path, purge_every=self.PURGE_EVERY)
+            self._file.connection().execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+
+    def allow(self, key: str) -> bool:
+        """Take a token from the bucket of a key.
+
+        Parameters
+        ----------
+        key : str
+            Bucket identification, like `user:admin` or `ip:10.0.0.1`.
+
+        Returns
+        -------
+        bool
+            `False` if the bucket is empty and the attempt must be refused.
+
+        """
+
+        if self.path is None:
+            return self._allow_local(key, time.time())
+        return self._allow_shared(key, time.time())
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated) * self.refill_rate)
+
+    def _allow_local(self, key: str, now: float) -> bool:
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = self._refill(tokens, updated, now)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+    def _allow_shared(self, key: str, now: float) -> bool:
+        with self._file.transaction() as db:
+            row = db.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = self.capacity if row is None else self._refill(*row, now)
+            allowed = tokens >= 1
+            db.execute(
+                "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)",
+                (key, tokens - 1 if allowed else tokens, now),
+            )
+
+            # Buckets refilled to capacity are the same as missing ones
+            if self._file.count_write():
+                db.execute(
+                    "DELETE FROM buckets WHERE updated < ?",
+                    (now - self.capacity / self.refill_rate,),
+                )
+        return allowed
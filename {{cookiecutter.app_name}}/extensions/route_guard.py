@@ -0,0 +1,135 @@
+from typing import Callable, Dict, Optional, Sequence
+from urllib.parse import quote
+
+from dash import dcc
+from dash._utils import to_json
+from flask import Flask, Response, redirect, request
+
+
+PUBLIC = "public"
+PRIVATE = "private"
+
+# Input and output of the callback Dash Pages uses to render the current page
+PAGES_LOCATION = "_pages_location"
+PAGES_CONTENT = "_pages_content"
+
+
+class RouteGuard:
+    """Authorize page requests in the server, before Dash is loaded.
+
+    The guard runs as a Flask `before_request` hook. Browsers loading a
+    private page without authorization are redirected before the Dash
+    renderer and its bundles are sent. In-app navigations are checked on the
+    Dash Pages routing callback, which then renders a redirect to the same
+    page instead of the requested one.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        Server the hook is added to.
+    status : callable
+        Function returning the HTTP status of the current user:
+        200 (authorized), 401 (not authenticated) or 403 (forbidden).
+    access : dict[str, {'public', 'private'}]
+        Access level of each path. Subpaths inherit the level of their
+        parents, so '/page2' also covers '/page2/subpage1'.
+    default : {'public', 'private'}, default='private'
+        Access level of paths missing from `access`.
+    login_path : str, default='/login'
+        Page that unauthenticated users are redirected to.
+    forbidden_path : str, default='/forbidden'
+        Page that unauthorized users are redirected to.
+    ignore : sequence of str, optional
+        Path prefixes that are never guarded, like Dash internal routes and
+        static files.
+
+    """
+
+    IGNORE = (
+        "/_dash-",
+        "/_reload-hash",
+        "/_favicon.ico",
+        "/assets/",
+        "/build/",
+        "/static/",
+    )
+
+    def __init__(
+        self,
+        server: Flask,
+        status: Callable[[], int],
+        access: Dict[str, str],
+        default: str = PRIVATE,
+        login_path: str = "/login",
+        forbidden_path: str = "/forbidden",
+        ignore: Optional[Sequence[str]] = None,
+    ):
+
+        self.status = status
+        self.access = {login_path: PUBLIC, forbidden_path: PUBLIC, **access}
+        self.default = default
+        self.login_path = login_path
+        self.forbidden_path = forbidden_path
+        self.ignore = tuple(self.IGNORE if ignore is None else ignore)
+
+        server.before_request(self.guard)
+
+    def level(self, path: str) -> str:
+        """Access level of a path."""
+
+        path = "/" + path.strip("/")
+        while True:
+            if path in self.access:
+                return self.access[path]
+            if path == "/":
+                return self.default
+            path = path.rsplit("/", 1)[0] or "/"
+
+    def authorize(self, path: str) -> int:
+        """HTTP status of the current user for a path."""
+
+        if self.level(path) == PUBLIC:
+            return 200
+        return self.status()
+
+    def guard(self) -> Optional[Response]:
+        if request.path.endswith("/_dash-update-component"):
+            return self._guard_navigation()
+        if request.method != "GET" or request.path.startswith(self.ignore):
+            return None
+
+        target = self.redirect_path(request.path)
+        return None if target is None else redirect(target)
+
+    def redirect_path(self, path: str) -> Optional[str]:
+        """Where the current user is sent instead of a path, if anywhere."""
+
+        status = self.authorize(path)
+        if status == 401:
+            return f"{self.login_path}?page={quote(path)}"
+        if status == 403:
+            return self.forbidden_path
+        return None
+
+    def _guard_navigation(self) -> Optional[Response]:
+        body = request.get_json(silent=True) or {}
+        for item in body.get("inputs", []):
+            if (
+                isinstance(item, dict)
+                and item.get("id") == PAGES_LOCATION
+                and item.get("property") == "pathname"
+            ):
+                target = self.redirect_path(item.get("value") or "/")
+                if target is not None:
+                    # Render a location that loads the target page
+                    location = dcc.Location(id="route-guard--location", href=target)
+                    return Response(
+                        to_json(
+                            {
+                                "multi": True,
+                                "response": {PAGES_CONTENT: {"children": location}},
+                            }
+                        ),
+                        mimetype="application/json",
+                    )
+        return None
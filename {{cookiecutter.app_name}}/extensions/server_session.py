@@ -0,0 +1,265 @@
+import copy
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from flask import Flask, Request, Response
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from ._sqlite import SQLiteFile
+
+
+def load_secret_key(path: str) -> str:
+    """Read a secret key from a file, creating it on first use.
+
+    The key is written to a temporary file, which is then linked to
+    `path` only if no other worker did it first. The file is never seen
+    empty or partially written, and every worker ends up with the same key.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file holding the key.
+
+    Returns
+    -------
+    str
+        Secret key.
+
+    """
+
+    if not os.path.exists(path):
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "w") as w:
+                w.write(secrets.token_hex(32))
+                w.flush()
+                os.fsync(w.fileno())
+            os.link(temp, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temp)
+
+    with open(path, "r") as r:
+        return r.read().strip()
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session whose data stays in the server."""
+
+    def __init__(
+        self, initial: Optional[dict] = None, sid: str = "", new: bool = False
+    ):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(copy.deepcopy(initial), on_update)
+        self.sid = sid
+        # Data as read from the store, to save only the keys that changed
+        self.initial = initial or {}
+        self.new = new
+        self.modified = False
+
+
+class MemorySessionStore:
+    """Sessions kept in the memory of the process.
+
+    Parameters
+    ----------
+    max_sessions : int, default=100000
+        Expired sessions are evicted when this size is reached.
+
+    """
+
+    def __init__(self, max_sessions: int = 100000):
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, sid: str) -> Optional[str]:
+        with self._lock:
+            data, expires = self._sessions.get(sid, (None, 0))
+        return data if expires > time.time() else None
+
+    def set(self, sid: str, data: str, expires: float):
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                now = time.time()
+                self._sessions = {k: v for k, v in self._sessions.items() if v[1] > now}
+            self._sessions[sid] = (data, expires)
+
+    def delete(self, sid: str):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+
+class SQLiteSessionStore:
+    """Sessions kept in a SQLite file shared by all workers of the server.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite file.
+
+    """
+
+    # Every how many writes the expired sessions are deleted
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = SQLiteFile(path, purge_every=self.PURGE_EVERY)
+        self._file.connection().execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(sid TEXT PRIMARY KEY, data TEXT, expires REAL)"
+        )
+
+    def get(self, sid: str) -> Optional[str]:
+        row = (
+            self._file.connection()
+            .execute(
+                "SELECT data FROM sessions WHERE sid = ? AND expires > ?",
+                (sid, time.time()),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def set(self, sid: str, data: str, expires: float):
+        db = self._file.connection()
+        db.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)", (sid, data, expires)
+        )
+        if self._file.count_write():
+            db.execute("DELETE FROM sessions WHERE expires < ?", (time.time(),))
+
+    def delete(self, sid: str):
+        self._file.connection().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+
+class ServerSessionInterface(SessionInterface):
+    """Flask sessions stored in the server, with only an ID in the cookie.
+
+    Keeps request headers small and avoids verifying and decoding a signed
+    cookie on every callback. Sessions read from the store are cached by
+    each worker for `cache_ttl` seconds.
+
+    Parameters
+    ----------
+    store : MemorySessionStore | SQLiteSessionStore
+        Where the sessions are kept. Use a SQLite store when the server has
+        more than one process.
+    ttl : float, default=86400
+        Seconds a session lasts after its last change.
+    cache_ttl : float, default=5
+        Seconds a session read from the store is reused by the worker. A
+        change made in another worker may take this long to be seen.
+    rotate_keys : sequence of str, default=('status', 'user')
+        Keys that change the privileges of the session. Changing them gives
+        the session a new ID, so an ID known before the login is useless.
+
+    Examples
+    --------
+    >>> server.session_interface = ServerSessionInterface(
+    ...     SQLiteSessionStore("data/sessions.db")
+    ... )
+
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(
+        self,
+        store,
+        ttl: float = 86400,
+        cache_ttl: float = 5,
+        rotate_keys: Sequence[str] = ("status", "user"),
+    ):
+        self.store = store
+        self.ttl = ttl
+        self.cache_ttl = cache_ttl
+        self.rotate_keys = frozenset(rotate_keys)
+        self._cache: Dict[str, Tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, sid: str) -> Optional[dict]:
+        now = time.monotonic()
+        with self._lock:
+            data, cached_until = self._cache.get(sid, (None, 0))
+        if cached_until > now:
+            return data
+
+        raw = self.store.get(sid)
+        data = None if raw is None else self.serializer.loads(raw)
+        with self._lock:
+            if len(self._cache) >= 10000:
+                self._cache.clear()
+            self._cache[sid] = (data, now + self.cache_ttl)
+        return data
+
+    def open_session(self, app: Flask, request: Request) -> ServerSession:
+        sid = request.cookies.get(app.config["SESSION_COOKIE_NAME"])
+        if sid:
+            data = self._load(sid)
+            if data is not None:
+                return ServerSession(data, sid=sid)
+        return ServerSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app: Flask, session: ServerSession, response: Response):
+        name = app.config["SESSION_COOKIE_NAME"]
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # Emptied session: forget it
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                with self._lock:
+                    self._cache.pop(session.sid, None)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not session.modified:
+            return
+
+        # Apply the changed keys over the latest data in the store, not over
+        # the cached copy, so keys written by other workers meanwhile are kept
+        changed = {
+            key: value
+            for key, value in session.items()
+            if key not in session.initial or session.initial[key] != value
+        }
+        deleted = session.initial.keys() - session.keys()
+        raw = None if session.new else self.store.get(session.sid)
+        data = {} if raw is None else self.serializer.loads(raw)
+        data.update(changed)
+        for key in deleted:
+            data.pop(key, None)
+
+        # New ID on login and other privilege changes, against fixation
+        if not session.new and self.rotate_keys & (changed.keys() | deleted):
+            self.store.delete(session.sid)
+            with self._lock:
+                self._cache.pop(session.sid, None)
+            session.sid = secrets.token_urlsafe(32)
+
+        self.store.set(session.sid, self.serializer.dumps(data), time.time() + self.ttl)
+        with self._lock:
+            self._cache[session.sid] = (data, time.monotonic() + self.cache_ttl)
+
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
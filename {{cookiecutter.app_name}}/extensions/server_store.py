@@ -0,0 +1,236 @@
+from collections import OrderedDict
+import hashlib
+import pickle
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import session
+
+from ._sqlite import SQLiteFile
+
+# (session ID, key)
+Key = Tuple[str, str]
+
+
+class ServerStore:
+    """Data of a `dcc.Store` kept in the server, with only a key in the browser.
+
+    Callbacks save their results with `put` and send the returned key to
+    the store, like `dashboard--data`. Callbacks reading the store turn the
+    key back into the data with `get`. Requests then carry a few bytes
+    instead of the data itself.
+
+    Entries belong to the session of the `ServerSessionInterface`, and are
+    left behind when its ID changes, like on login.
+
+    Data is kept in the process memory and, optionally, in a SQLite file
+    shared by all the processes of the server, so any gunicorn worker can
+    read the data saved by another. Each session keeps its `max_items`
+    most recently used entries, and sessions idle for `ttl` seconds are
+    evicted.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file shared by all the processes of the server. If `None`,
+        data is only kept in the process memory.
+    max_items : int, default=8
+        Entries kept for each session.
+    ttl : float, default=3600
+        Seconds an entry is kept after its last use.
+    memory_bytes : int, default=67108864
+        Size of the entries kept in memory by this process (64 MB). The
+        least recently used entries are discarded first, and read again
+        from the SQLite file if needed.
+
+    Examples
+    --------
+    >>> store = ServerStore("data/store.db")
+    >>> @callback(Output("dashboard--data", "data"), Input("dropdown", "value"))
+    ... def load(value):
+    ...     return store.put(query(value).to_dict("records"))
+    >>> @callback(Output("graph", "figure"), Input("dashboard--data", "data"))
+    ... def plot(key):
+    ...     return px.line(store.get(key))
+
+    Notes
+    -----
+    Data is shared, not copied, between the requests of a process and must
+    not be changed in place. The SQLite file is trusted, like the other
+    files in `data`, since data is stored with `pickle`.
+
+    """
+
+    # Every how many writes the idle entries are deleted
+    PURGE_EVERY = 1000
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_items: int = 8,
+        ttl: float = 3600,
+        memory_bytes: int = 64 * 2**20,
+    ):
+
+        self.path = path
+        self.max_items = max_items
+        self.ttl = ttl
+        self.memory_bytes = memory_bytes
+
+        # Value, size and last use of every entry, the least recently used
+        # first, and the keys of each session in the same order
+        self._memory: "OrderedDict[Key, Tuple[Any, int, float]]" = OrderedDict()
+        self._sessions: "Dict[str, OrderedDict[str, None]]" = {}
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path is not None:
+            self._file = SQLiteFile(path, purge_every=self.PURGE_EVERY)
+            db = self._file.connection()
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS store (sid TEXT, key TEXT, "
+                "value BLOB, used REAL, PRIMARY KEY (sid, key))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS store_used ON store (used)")
+
+    @staticmethod
+    def _sid() -> Optional[str]:
+        """ID of the current session, or `None` if it was not saved yet."""
+
+        if not hasattr(session, "sid"):
+            raise RuntimeError("ServerStore requires the ServerSessionInterface.")
+        return None if session.new else session.sid
+
+    def put(self, value: Any) -> str:
+        """Save data for the current session.
+
+        Parameters
+        ----------
+        value : any
+            Data that can be pickled.
+
+        Returns
+        -------
+        str
+            Key of the data, to be sent to the `dcc.Store`. The same data
+            always gets the same key.
+
+        """
+
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        key = hashlib.sha256(data).hexdigest()[:32]
+        sid = self._sid()
+        if sid is None:
+            # Save the new session, so its ID reaches the browser
+            session["store"] = True
+            sid = session.sid
+        now = time.time()
+
+        self._remember((sid, key), value, len(data), now)
+
+        if self.path is not None:
+            with self._file.transaction() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO store VALUES (?, ?, ?, ?)",
+                    (sid, key, data, now),
+                )
+                db.execute(
+                    "DELETE FROM store WHERE sid = ? AND key NOT IN "
+                    "(SELECT key FROM store WHERE sid = ? ORDER BY used DESC LIMIT ?)",
+                    (sid, sid, self.max_items),
+                )
+                if self._file.count_write():
+                    db.execute("DELETE FROM store WHERE used < ?", (now - self.ttl,))
+
+        return key
+
+    def get(self, key: Optional[str]) -> Any:
+        """Data of a key saved by the current session.
+
+        Returns
+        -------
+        any
+            The data, or `None` if the key is empty, evicted or saved by
+            another session.
+
+        """
+
+        sid = self._sid()
+        if not key or sid is None:
+            return None
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get((sid, key))
+            if entry is not None and entry[2] > now - self.ttl:
+                self._memory[sid, key] = (entry[0], entry[1], now)
+                self._memory.move_to_end((sid, key))
+                self._sessions[sid].move_to_end(key)
+                return entry[0]
+            self._discard((sid, key))
+
+        if self.path is None:
+            return None
+
+        db = self._file.connection()
+        row = db.execute(
+            "SELECT value FROM store WHERE sid = ? AND key = ? AND used > ?",
+            (sid, key, now - self.ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        db.execute(
+            "UPDATE store SET used = ? WHERE sid = ? AND key = ?", (now, sid, key)
+        )
+        value = pickle.loads(row[0])
+        self._remember((sid, key), value, len(row[0]), now)
+        return value
+
+    def _remember(self, key: Key, value: Any, size: int, now: float):
+        """Keep an entry in memory, evicting the least recently used ones."""
+
+        sid = key[0]
+        with self._lock:
+            self._discard(key)
+            self._memory[key] = (value, size, now)
+            self._memory_size += size
+            keys = self._sessions.setdefault(sid, OrderedDict())
+            keys[key[1]] = None
+
+            while len(keys) > self.max_items:
+                self._discard((sid, next(iter(keys))))
+
+            # Entries of any session, while the memory is full or they are idle
+            while self._memory:
+                oldest, (_, _, used) = next(iter(self._memory.items()))
+                if oldest == key or (
+                    self._memory_size <= self.memory_bytes and used > now - self.ttl
+                ):
+                    break
+                self._discard(oldest)
+
+    def _discard(self, key: Key):
+        """Remove an entry from memory. The lock must be held."""
+
+        entry = self._memory.pop(key, None)
+        if entry is None:
+            return
+        self._memory_size -= entry[1]
+        keys = self._sessions[key[0]]
+        del keys[key[1]]
+        if not keys:
+            del self._sessions[key[0]]
+
+    def clear(self):
+        """Delete every entry of the current session, like on logout."""
+
+        sid = self._sid()
+        if sid is None:
+            return
+        with self._lock:
+            for key in list(self._sessions.get(sid, ())):
+                self._discard((sid, key))
+        if self.path is not None:
+            self._file.connection().execute("DELETE FROM store WHERE sid = ?", (sid,))
@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+from typing import Dict, List, Optional
+
+from flask import Flask, abort, request, send_from_directory
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _write(path: str, content: bytes):
+    """Write a file atomically, so concurrent workers never read half of it."""
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as w:
+        w.write(content)
+    os.replace(tmp, path)
+
+
+def fingerprint(source: str, folder: str) -> str:
+    """Write a content-hashed copy of a file and its compressed siblings.
+
+    Parameters
+    ----------
+    source : str
+        Path of the original file.
+    folder : str
+        Folder where the files are written.
+
+    Returns
+    -------
+    str
+        Name of the fingerprinted file, like `theme.1a2b3c4d5e6f.css`.
+
+    """
+
+    with open(source, "rb") as r:
+        content = r.read()
+
+    stem, ext = os.path.splitext(os.path.basename(source))
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    name = f"{stem}.{digest}{ext}"
+    path = os.path.join(folder, name)
+
+    # Same name means same content
+    if os.path.exists(path):
+        return name
+
+    os.makedirs(folder, exist_ok=True)
+    _write(path, content)
+    _write(f"{path}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write(f"{path}.br", brotli.compress(content, quality=11))
+
+    return name
+
+
+class PrecompressedAssets:
+    """Serve fingerprinted and precompressed copies of static files.
+
+    Each source file is copied to `{folder}/{name}.{hash}.{ext}` along with
+    its `.gz` and `.br` versions. The route picks the smallest variant the
+    browser accepts and marks it as immutable, since a new content always
+    gets a new URL.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        Server the route is added to.
+    sources : list of str
+        Paths of the files to be served.
+    folder : str, default='build'
+        Folder where the fingerprinted files are written.
+    url_prefix : str, default='/build'
+        URL of the route.
+    max_age : int, default=31536000
+        Seconds the browser keeps the files (one year).
+
+    Attributes
+    ----------
+    manifest : dict[str, str]
+        Fingerprinted file name of each source.
+    urls : list of str
+        URLs of the fingerprinted files, in the same order as `sources`.
+
+    Notes
+    -----
+    Brotli files are only written if the `brotli` package is installed.
+
+    """
+
+    ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+    def __init__(
+        self,
+        server: Flask,
+        sources: List[str],
+        folder: str = "build",
+        url_prefix: str = "/build",
+        max_age: int = 31536000,
+    ):
+
+        self.folder = os.path.abspath(folder)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_age = max_age
+        self.manifest = self.build(sources)
+        self._files = set(self.manifest.values())
+
+        server.add_url_rule(
+            f"{self.url_prefix}/<path:filename>",
+            endpoint="precompressed_assets",
+            view_func=self.serve,
+        )
+
+    @property
+    def urls(self) -> List[str]:
+        return [f"{self.url_prefix}/{name}" for name in self.manifest.values()]
+
+    def build(self, sources: List[str]) -> Dict[str, str]:
+        """Fingerprint the sources and save the manifest."""
+
+        manifest = {source: fingerprint(source, self.folder) for source in sources}
+        _write(
+            os.path.join(self.folder, "manifest.json"),
+            json.dumps(manifest, indent=2).encode(),
+        )
+        return manifest
+
+    def url(self, source: str) -> str:
+        """Fingerprinted URL of a source file."""
+        return f"{self.url_prefix}/{self.manifest[source]}"
+
+    def serve(self, filename: str):
+        if filename not in self._files:
+            abort(404)
+
+        encoding: Optional[str] = None
+        suffix = ""
+        for name, ext in self.ENCODINGS:
+            if request.accept_encodings.quality(name) > 0 and os.path.exists(
+                os.path.join(self.folder, filename + ext)
+            ):
+                encoding, suffix = name, ext
+                break
+
+        response = send_from_directory(
+            self.folder,
+            filename + suffix,
+            mimetype=mimetypes.guess_type(filename)[0],
+            download_name=os.path.basename(filename),
+            conditional=True,
+        )
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = (
+            f"public, max-age={self.max_age}, immutable"
+        )
+        return response
+
+
+if __name__ == "__main__":
+    # Usage: python -m extensions.static_files assets/css/theme.css
+    for source in sys.argv[1:]:
+        print(f"{source} -> {fingerprint(source, 'build')}")
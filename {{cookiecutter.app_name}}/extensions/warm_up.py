@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+import dash
+from dash import Dash
+from dash._utils import to_json
+from flask import Response
+
+
+class WarmUp:
+    """Build the app once before it takes traffic, with a readiness route.
+
+    The warm-up requests the Dashboard shell and the callback list, which
+    runs the first-request setup of Dash and fills the frozen routes, then,
+    optionally, builds and serializes the layout of every registered page,
+    importing lazy pages. The readiness route answers `503` until it is done, so load
+    balancers only send users to warm workers.
+
+    Failures are logged instead of raised, so a broken route or page does
+    not stop the worker from booting. Pages fail on their own requests, and
+    a failed route keeps the readiness route at `503`.
+
+    Parameters
+    ----------
+    app : dash.Dash
+        Dash app, with its layout, pages and callbacks already registered.
+    route : str, default='/ready'
+        URL of the readiness route.
+    background : bool, default=False
+        Warm up in a thread, serving requests meanwhile, instead of before
+        this returns.
+    pages : bool, default=True
+        Build every page too. Otherwise pages are built on their first
+        request, or when `warm_pages` is called.
+
+    Attributes
+    ----------
+    costs : dict[str, float]
+        Seconds spent on each route and page.
+    failed : list of str
+        Routes and pages that could not be built.
+
+    Examples
+    --------
+    >>> warm_up = WarmUp(app, background=True)
+
+    """
+
+    def __init__(
+        self,
+        app: Dash,
+        route: str = "/ready",
+        background: bool = False,
+        pages: bool = True,
+    ):
+
+        self.app = app
+        self.pages = pages
+        self.costs: Dict[str, float] = {}
+        self.failed: List[str] = []
+        self._ready = threading.Event()
+
+        app.server.add_url_rule(route, endpoint="warm_up_ready", view_func=self.serve)
+
+        if background:
+            threading.Thread(target=self.warm, name="warm-up", daemon=True).start()
+        else:
+            self.warm()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the warm-up finished and built the shell and callbacks."""
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the warm-up is ready, and return whether it is."""
+        return self._ready.wait(timeout)
+
+    def warm(self):
+        """Build the shell, the callback list and, optionally, every page."""
+
+        server = self.app.server
+        client = server.test_client()
+        routes_ok = True
+        for route in ("_dash-layout", "_dash-dependencies"):
+            started = time.perf_counter()
+            response = client.get(f"{self.app.config.routes_pathname_prefix}{route}")
+            self.costs[route] = time.perf_counter() - started
+            if response.status_code != 200:
+                # The error was logged by Flask, the worker stays unready
+                server.logger.error(
+                    "Could not warm up %s, it answered %s.",
+                    route,
+                    response.status_code,
+                )
+                self.failed.append(route)
+                routes_ok = False
+
+        if self.pages:
+            self.warm_pages()
+
+        if routes_ok:
+            self._ready.set()
+
+    def warm_pages(self):
+        """Build and serialize the layout of every registered page once."""
+
+        server = self.app.server
+        for module, page in list(dash.page_registry.items()):
+            started = time.perf_counter()
+            try:
+                with server.test_request_context(page["path"]):
+                    layout = page["layout"]
+                    to_json(layout() if callable(layout) else layout)
+            except Exception:  # pylint: disable=broad-except
+                # A broken page fails on its own requests, not the whole worker
+                server.logger.exception("Could not warm up %s.", module)
+                self.failed.append(module)
+            self.costs[module] = time.perf_counter() - started
+
+    def serve(self) -> Response:
+        response = Response(
+            "ready" if self.ready else "warming up",
+            status=200 if self.ready else 503,
+            mimetype="text/plain",
+        )
+        response.headers["Cache-Control"] = "no-store"
+        return response
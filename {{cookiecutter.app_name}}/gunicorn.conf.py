@@ -0,0 +1,46 @@
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '{{cookiecutter.port}}')}"
+
+# Import the app once in the master, shared copy-on-write by the workers
+preload_app = True
+
+# One process per CPU, each serving requests from a few threads
+cpus = (
+    len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+)
+workers = int(os.environ.get("WEB_CONCURRENCY", cpus))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+
+# Restart workers after a while, not all at once, to release leaked memory
+max_requests = 1000
+max_requests_jitter = 100
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+errorlog = "-"
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def pre_fork(server, worker):
+    import app
+
+    # Threads do not survive a fork, stop the log writer before it
+    app.error_log.stop()
+    app.callback_metrics.flush()
+
+    # Keep the objects of the app out of the garbage collector, which would
+    # otherwise copy their memory pages in every worker
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import app
+
+    # Each worker writes its own log queue. SQLite connections and caches
+    # are keyed by process, so they are reopened on first use
+    app.error_log.start()
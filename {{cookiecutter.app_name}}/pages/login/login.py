@@ -1,4 +1,4 @@
-from socket import gethostname
+from urllib.parse import parse_qs
 
 from dash import register_page, callback, Output, Input, State, html, no_update
 
@@ -32,17 +32,23 @@ layout = ll.LoginPage(
     Output("login-page--location", "href"),
     Output("login-form--subtitle", "children"),
     Input("login-form--button", "n_clicks"),
-    Input("login-form--password", "value"),
+    Input("login-form--user", "n_submit"),
+    Input("login-form--password", "n_submit"),
     State("login-form--user", "value"),
+    State("login-form--password", "value"),
     State("login-page--location", "search"),
     prevent_initial_call=True,
 )
-def login(_, password, username, search):
+def login(n_clicks, user_submit, password_submit, username, password, search):
+
+    # Nothing to check until both fields are filled
+    if not username or not password:
+        return no_update, no_update
 
     # Trying to authenticate
     try:
         LoginAuth(username, password)
-        path = "/".join(search.split("/")[1:])
+        path = parse_qs((search or "").lstrip("?"))["page"][0]
 
     # Error on authentication
     except LoginError as err:
@@ -55,12 +61,16 @@ def login(_, password, username, search):
         )
 
     # Default initial page
-    except ValueError:
-        path = "page1"
+    except KeyError:
+        path = "/page1"
+
+    # Only paths inside the app, never other hosts
+    if not path.startswith("/") or path[1:2] in ("/", "\\"):
+        path = "/page1"
 
     # Successfully authenticated
     return (
-        f"http://{gethostname()}:{{cookiecutter.port}}/{path}",
+        path,
         html.Span(
             [html.I(className="fas fa-check-circle me-2"), html.Span("Logged in!")],
             className="green",
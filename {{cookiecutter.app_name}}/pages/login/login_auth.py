@@ -1,16 +1,56 @@
-from flask import session
+from typing import Optional
+
+from flask import request, session
+
+from extensions.rate_limit import RateLimiter
+from .login_backend import FileBackend
 
 
 class LoginError(BaseException):
     pass
 
 
+# Attempts are counted in a file shared by all workers, or in memory
+LIMITER_PATH = {% if cookiecutter.environment == "linux" %}"data/login_attempts.db"{% else %}None{% endif %}
+
+
 class LoginAuth:
+    # Loaded once per worker. Add users with:
+    # python -m pages.login.login_backend data/users.json <username>
+    BACKEND = FileBackend("data/users.json")
+
+    # Bursts of 5 attempts per user, then one every 12 seconds
+    USER_LIMITER = RateLimiter(capacity=5, refill_rate=1 / 12, path=LIMITER_PATH)
+
+    # Bursts of 20 attempts per client IP, then one per second
+    IP_LIMITER = RateLimiter(capacity=20, refill_rate=1, path=LIMITER_PATH)
+
     def __init__(self, username: str, password: str):
+        self._throttle(username)
         session["status"] = self._log_user(username, password)
+        session["user"] = username
+
+    def _throttle(self, username: str):
+        """Refuse the attempt before the password is checked if the user or
+        the client IP made too many attempts.
+
+        `request.remote_addr` is the client IP read by the `ProxyFix` of
+        `app.py`, or the proxy IP if `PROXY_HOPS` is not set behind one,
+        which would make every client share one bucket.
+
+        """
+
+        if not (
+            self.IP_LIMITER.allow(f"ip:{request.remote_addr}")
+            and self.USER_LIMITER.allow(f"user:{username}")
+        ):
+            raise LoginError("Too many attempts, try again later")
 
     def _log_user(self, username: str, password: str):
-        """Add your authentication system in this method.
+        """Check the credentials against `BACKEND`.
+
+        Replace `BACKEND` with any `CredentialBackend`, like
+        `SQLiteBackend`, to change where users are stored.
 
         Parameters
         ----------
@@ -24,15 +64,11 @@ class LoginAuth:
 
         """
 
-        # Placeholder user list
-        USERS = {
-            "admin": "admin",
-            "guest": "guest",
-        }
+        valid = self.BACKEND.verify(username, password)
 
-        if username not in USERS:
+        if valid is None:
             raise LoginError("User not found")
-        elif USERS[username] != password:
+        elif not valid:
             raise LoginError("Incorrect password")
         else:
             return 200
@@ -54,3 +90,8 @@ class LoginAuth:
             return session["status"]
         else:
             return 401
+
+    @staticmethod
+    def current_user() -> Optional[str]:
+        """Username of the current session, or `None` if not logged in."""
+        return session.get("user")
@@ -0,0 +1,197 @@
+import abc
+from collections import OrderedDict
+import getpass
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from extensions._sqlite import SQLiteFile
+
+
+# Salted PBKDF2, deliberately slow to compute
+HASH_METHOD = "pbkdf2:sha256:600000"
+
+
+def hash_password(password: str) -> str:
+    """Salted, slow hash of a password, ready to be stored."""
+    return generate_password_hash(password, method=HASH_METHOD)
+
+
+class VerificationCache:
+    """Bounded LRU of recently successful verifications.
+
+    Entries are keyed by an HMAC of the credentials and the stored hash,
+    with a random key per process, so the cache never holds passwords and
+    changing a password invalidates its entries.
+
+    Parameters
+    ----------
+    maxsize : int, default=1024
+        Maximum number of entries.
+    ttl : float, default=300
+        Seconds an entry is valid.
+
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._secret = os.urandom(32)
+        self._entries: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, username: str, password: str, stored_hash: str) -> bytes:
+        message = "\0".join([username, password, stored_hash]).encode()
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def __contains__(self, key: bytes) -> bool:
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key: bytes):
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class CredentialBackend(abc.ABC):
+    """Base class of the credential backends used by `LoginAuth`.
+
+    Subclasses implement `password_hash` and `add_user`. Successful
+    verifications are cached for a short time, so busy shared accounts do
+    not pay the full hash cost on every login.
+
+    Parameters
+    ----------
+    cache_size : int, default=1024
+        Maximum number of cached verifications.
+    cache_ttl : float, default=300
+        Seconds a verification stays cached.
+
+    """
+
+    def __init__(self, cache_size: int = 1024, cache_ttl: float = 300):
+        self.cache = VerificationCache(maxsize=cache_size, ttl=cache_ttl)
+
+    @abc.abstractmethod
+    def password_hash(self, username: str) -> Optional[str]:
+        """Stored hash of a user, or `None` if the user does not exist."""
+
+    @abc.abstractmethod
+    def add_user(self, username: str, password: str):
+        """Create a user or change its password."""
+
+    def verify(self, username: str, password: str) -> Optional[bool]:
+        """Check the credentials of a user.
+
+        Returns
+        -------
+        bool | None
+            Whether the password is correct, or `None` if the user does not
+            exist.
+
+        """
+
+        stored_hash = self.password_hash(username)
+        if stored_hash is None:
+            return None
+
+        key = self.cache.key(username, password, stored_hash)
+        if key in self.cache:
+            return True
+
+        valid = check_password_hash(stored_hash, password)
+        if valid:
+            self.cache.add(key)
+        return valid
+
+
+class FileBackend(CredentialBackend):
+    """Credentials stored in a JSON file, as `{username: hash}`.
+
+    The file is read once, when the backend is created.
+
+    Parameters
+    ----------
+    path : str
+        Path of the JSON file.
+    **kwargs
+        Arguments of `CredentialBackend`.
+
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        try:
+            with open(path, "r") as r:
+                self.users: Dict[str, str] = json.load(r)
+        except FileNotFoundError:
+            self.users = {}
+
+    def password_hash(self, username: str) -> Optional[str]:
+        return self.users.get(username)
+
+    def add_user(self, username: str, password: str):
+        self.users[username] = hash_password(password)
+        with open(self.path, "w") as w:
+            json.dump(self.users, w, indent=4)
+
+
+class SQLiteBackend(CredentialBackend):
+    """Credentials stored in a SQLite table.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite file.
+    **kwargs
+        Arguments of `CredentialBackend`.
+
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = SQLiteFile(path)
+        self._file.connection().execute(
+            "CREATE TABLE IF NOT EXISTS users "
+            "(username TEXT PRIMARY KEY, password_hash TEXT NOT NULL)"
+        )
+
+    def password_hash(self, username: str) -> Optional[str]:
+        row = (
+            self._file.connection()
+            .execute("SELECT password_hash FROM users WHERE username = ?", (username,))
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def add_user(self, username: str, password: str):
+        self._file.connection().execute(
+            "INSERT OR REPLACE INTO users VALUES (?, ?)",
+            (username, hash_password(password)),
+        )
+
+
+if __name__ == "__main__":
+    # Usage: python -m pages.login.login_backend data/users.json <username>
+    path, username = sys.argv[1:3]
+    backend = SQLiteBackend(path) if path.endswith(".db") else FileBackend(path)
+    backend.add_user(username, getpass.getpass())
@@ -1,9 +1,10 @@
-from typing import Optional
-from uuid import uuid4
+from typing import Optional, Union
 
 from dash import html, dcc
 from dash_iconify import DashIconify
 
+from components.component_id import auto_id
+
 
 class LoginSvgPanel(html.Div):
     """A panel containing an image.
@@ -58,6 +59,10 @@ class LoginForm(html.Div):
         Text of the submit button.
     button_color : str, default='blue'
         Color class of the submit button.
+    debounce : bool | float, default=True
+        When the input values are sent to the server. If `True`, only on
+        Enter or when the field loses focus. If a number, after the user
+        stops typing for that many seconds. If `False`, on every keystroke.
 
     Component Properties
     --------------------
@@ -68,12 +73,19 @@ class LoginForm(html.Div):
     {id}--subtitle
         Subtitle text element.
     {id}--user
-        Value of the user input field.
+        Value of the user input field. Its `n_submit` counts Enter presses.
     {id}--password
-        Value of the password input field.
+        Value of the password input field. Its `n_submit` counts Enter
+        presses.
     {id}--button
         Submit button.
 
+    Notes
+    -----
+    Trigger the authentication with the `n_clicks` of the button and the
+    `n_submit` of the fields, reading their values as `State`, so it runs
+    once per attempt instead of once per keystroke.
+
     """
 
     def __init__(
@@ -87,9 +99,11 @@ class LoginForm(html.Div):
         password_placeholder: str = "Password",
         button_text: str = "Log in",
         button_color: str = "blue",
+        debounce: Union[bool, float] = True,
     ):
 
-        self.id = id or str(uuid4())
+        self.id = id or auto_id("login-form")
+        self.debounce = debounce
 
         super().__init__(
             style={"min-height": "100%", "text-align": "left", "padding": 40},
@@ -126,7 +140,12 @@ class LoginForm(html.Div):
             className="input-field",
             children=[
                 DashIconify(icon="fa-solid:user"),
-                dcc.Input(id=f"{self.id}--user", type="text", placeholder=placeholder),
+                dcc.Input(
+                    id=f"{self.id}--user",
+                    type="text",
+                    placeholder=placeholder,
+                    debounce=self.debounce,
+                ),
             ],
         )
 
@@ -139,7 +158,7 @@ class LoginForm(html.Div):
                     id=f"{self.id}--password",
                     type="password",
                     placeholder=placeholder,
-                    debounce=True,
+                    debounce=self.debounce,
                 ),
             ],
         )
@@ -175,7 +194,8 @@ class LoginPage(html.Div):
     {id}--right-panel : list of Dash components
         Content of the right panel.
     {id}--location : dash.dcc.Location
-        URL manager.
+        URL manager. Changing its `href` navigates inside the app, without
+        reloading the page.
 
     """
 
@@ -188,7 +208,7 @@ class LoginPage(html.Div):
         id: Optional[str] = None,
     ):
 
-        id = id or str(uuid4())
+        id = id or auto_id("login-page")
 
         total_width = left_panel_width + right_panel_width
         left_panel_width /= total_width
@@ -196,7 +216,7 @@ class LoginPage(html.Div):
 
         super().__init__(
             children=[
-                dcc.Location(id=f"{id}--location"),
+                dcc.Location(id=f"{id}--location", refresh="callback-nav"),
                 html.Div(
                     children=[
                         html.Div(